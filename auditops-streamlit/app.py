@@ -14,8 +14,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS
-st.markdown("""
+# Custom CSS - built once at import. It is still emitted on every run because
+# Streamlit drops any element that a rerun doesn't re-emit.
+CUSTOM_CSS = """
     <style>
     .main-header {
         font-size: 2.5rem;
@@ -29,7 +30,8 @@ st.markdown("""
         padding: 2rem;
     }
     </style>
-""", unsafe_allow_html=True)
+"""
+st.html(CUSTOM_CSS)  # pure HTML - skips the Markdown parser
 
 
 def login_with_pin(pin_code: str) -> tuple[bool, str, dict | None]:
@@ -48,8 +50,15 @@ def login_with_pin(pin_code: str) -> tuple[bool, str, dict | None]:
         client = get_client(service_role=True)  # Use service role to bypass RLS
 
         # Query app_users table for matching passcode
-        # Expected columns: id (integer), name, passcode, role
-        response = client.table('app_users').select("*").eq('passcode', pin_code).execute()
+        # Only fetch the columns the session needs, and stop at the first match
+        # (indexed by idx_app_users_passcode - see sql_diagnostics/add_performance_indexes.sql)
+        response = (
+            client.table('app_users')
+            .select("id, auth_uuid, name, role")
+            .eq('passcode', pin_code)
+            .limit(1)
+            .execute()
+        )
 
         if response.data and len(response.data) > 0:
             # Found matching user
@@ -91,13 +100,18 @@ def update_user_pin(user_id: int, new_pin: str) -> tuple[bool, str]:
         return False, f"Error updating PIN: {str(e)}"
 
 
+@st.fragment
 def show_login_page():
-    """Display PIN-based login page."""
+    """
+    Display PIN-based login page.
+
+    Runs as a fragment, so a rejected PIN reruns only the login form.
+    A successful login triggers a full app rerun to switch to the main app.
+    """
     st.markdown('<div class="login-container">', unsafe_allow_html=True)
 
     st.markdown('<h1 class="main-header">AuditOps</h1>', unsafe_allow_html=True)
-    st.markdown("### Operations Portal")
-    st.markdown("---")
+    st.markdown("### Operations Portal\n\n---")
 
     with st.form("login_form"):
         st.markdown("#### Enter your 4-digit Access Code")
@@ -133,15 +147,76 @@ def show_login_page():
                         }
                         st.session_state.authenticated = True
                         st.success("Login successful!")
-                        st.rerun()
+                        st.rerun(scope="app")
                     else:
                         st.error(error_msg)
 
     st.markdown("</div>", unsafe_allow_html=True)
 
 
+@st.fragment
+def show_sidebar(user_name: str, user_role: str, app_user_id: int | None):
+    """
+    Show sidebar with user info, PIN change form and logout.
+
+    Runs as a fragment, so submitting the PIN form reruns only the sidebar.
+    Logout still triggers a full app rerun.
+    """
+    st.markdown(f"### 👤 {user_name}\n\n**Role:** {user_role}\n\n---")
+
+    # Change PIN section
+    with st.expander("🔐 Change My PIN", expanded=False):
+        with st.form("change_pin_form"):
+            new_pin = st.text_input(
+                "New 4-Digit PIN",
+                type="password",
+                max_chars=4,
+                placeholder="****",
+                help="Enter your new 4-digit PIN"
+            )
+            confirm_pin = st.text_input(
+                "Confirm New PIN",
+                type="password",
+                max_chars=4,
+                placeholder="****",
+                help="Re-enter your new PIN"
+            )
+            update_button = st.form_submit_button("Update PIN", use_container_width=True)
+
+            if update_button:
+                if not new_pin or not confirm_pin:
+                    st.error("Please enter both fields.")
+                elif len(new_pin) != 4:
+                    st.error("PIN must be exactly 4 digits.")
+                elif not new_pin.isdigit():
+                    st.error("PIN must contain only numbers.")
+                elif new_pin != confirm_pin:
+                    st.error("PINs do not match. Please try again.")
+                else:
+                    success, message = update_user_pin(app_user_id, new_pin)
+                    if success:
+                        st.success(message)
+                    else:
+                        st.error(message)
+
+    st.markdown("---")
+    st.info("💡 Use the page selector above to navigate.")
+    st.markdown("---")
+
+    if st.button("🚪 Logout", use_container_width=True):
+        # Clear session state
+        for key in ('user', 'authenticated'):
+            st.session_state.pop(key, None)
+        st.rerun()
+
+
 def show_main_app():
-    """Show main application with PIN change feature."""
+    """
+    Show main application with PIN change feature.
+
+    Not a fragment itself - fragments can't write to the sidebar - so the
+    interactive sidebar is the fragment instead.
+    """
     user = st.session_state.get('user', {})
     user_name = user.get('name', 'User')
     user_id = user.get('id')  # UUID for database queries
@@ -150,64 +225,15 @@ def show_main_app():
 
     # Sidebar navigation
     with st.sidebar:
-        st.markdown(f"### 👤 {user_name}")
-        st.markdown(f"**Role:** {user_role}")
-        st.markdown("---")
-
-        # Change PIN section
-        with st.expander("🔐 Change My PIN", expanded=False):
-            with st.form("change_pin_form"):
-                new_pin = st.text_input(
-                    "New 4-Digit PIN",
-                    type="password",
-                    max_chars=4,
-                    placeholder="****",
-                    help="Enter your new 4-digit PIN"
-                )
-                confirm_pin = st.text_input(
-                    "Confirm New PIN",
-                    type="password",
-                    max_chars=4,
-                    placeholder="****",
-                    help="Re-enter your new PIN"
-                )
-                update_button = st.form_submit_button("Update PIN", use_container_width=True)
-
-                if update_button:
-                    if not new_pin or not confirm_pin:
-                        st.error("Please enter both fields.")
-                    elif len(new_pin) != 4:
-                        st.error("PIN must be exactly 4 digits.")
-                    elif not new_pin.isdigit():
-                        st.error("PIN must contain only numbers.")
-                    elif new_pin != confirm_pin:
-                        st.error("PINs do not match. Please try again.")
-                    else:
-                        success, message = update_user_pin(app_user_id, new_pin)
-                        if success:
-                            st.success(message)
-                        else:
-                            st.error(message)
-
-        st.markdown("---")
-        st.info("💡 Use the page selector above to navigate.")
-        st.markdown("---")
-
-        if st.button("🚪 Logout", use_container_width=True):
-            # Clear session state
-            if 'user' in st.session_state:
-                del st.session_state.user
-            if 'authenticated' in st.session_state:
-                del st.session_state.authenticated
-            st.rerun()
-
-    # Main content area
-    st.markdown(f"# Welcome, {user_name}!")
-    st.markdown(f"**Role:** {user_role}")
-    st.markdown("---")
+        show_sidebar(user_name, user_role, app_user_id)
+
+    # Main content area (role is already shown in the sidebar)
+    st.markdown(f"# Welcome, {user_name}!\n\n---")
     st.info("👈 Use the sidebar to navigate to different sections.")
-    st.markdown("### Your Dashboard")
-    st.write("This is your main application area. Navigate using the page selector in the sidebar above.")
+    st.markdown(
+        "### Your Dashboard\n\n"
+        "This is your main application area. Navigate using the page selector in the sidebar above."
+    )
 
 
 def main():
@@ -2,16 +2,184 @@
 Invoice Ingestion Engine
 Handles processing of invoice files from different vendors (CSV and PDF formats).
 """
+import numpy as np
 import pandas as pd
 import pdfplumber
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process
+from rapidfuzz.utils import default_process
+import multiprocessing
+import os
 import re
-from typing import Optional, Dict, Any
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from functools import lru_cache
+from typing import Optional, Dict, Any, Iterator
 from io import BytesIO
 import logging
 
+try:
+    import fitz  # PyMuPDF - much faster plain-text extraction than pdfplumber
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Upper bound on worker processes for parallel PDF table extraction
+MAX_PDF_WORKERS = 4
+
+# Compiled once at import - these run for every PDF header and table row
+_INVOICE_NUM_RE = re.compile(
+    r'(?:Invoice\s*#?|Invoice\s*Number|INVOICE\s*NO\.?)\s*:?\s*([A-Z0-9\-]+)',
+    re.IGNORECASE
+)
+_DATE_RE = re.compile(
+    r'(?:Date|Invoice\s*Date)\s*:?\s*(\d{1,2}[/\-]\d{1,2}[/\-]\d{2,4})',
+    re.IGNORECASE
+)
+_YMD_RE = re.compile(r'(\d{4}-\d{2}-\d{2})')
+_SIZE_STRIP_RE = re.compile(r'[^\d.\sLMKGT]')
+_SIZE_RE = re.compile(r'(?P<num>\d+(?:\.\d+)?)\s*(?P<unit>ML|L)?')
+
+
+@lru_cache(maxsize=4096)
+def _clean_date_str(date_str: str) -> str:
+    """
+    Clean a date string to YYYY-MM-DD format.
+    
+    Memoized, since invoices repeat the same few dates on every row.
+    
+    Args:
+        date_str: Date as a string
+        
+    Returns:
+        str: Date in YYYY-MM-DD format, or the stripped input if it can't be parsed
+    """
+    # Try parsing with pandas (handles various formats)
+    try:
+        parsed_date = pd.to_datetime(date_str)
+        return parsed_date.strftime('%Y-%m-%d')
+    except:
+        # If parsing fails, try simple regex extraction
+        # Look for YYYY-MM-DD pattern
+        date_match = _YMD_RE.search(date_str)
+        if date_match:
+            return date_match.group(1)
+        
+        # Return original if we can't parse
+        return date_str.strip()
+
+
+def _extract_tables_in_range(pdf_bytes: bytes, start: int, stop: int) -> list:
+    """
+    Extract raw tables for pages [start, stop) of a PDF.
+    
+    Module-level so ProcessPoolExecutor workers can pickle and run it.
+    
+    Returns:
+        list: One list of tables per page, in page order
+    """
+    page_tables = []
+    with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
+        for page_num in range(start, stop):
+            page = pdf.pages[page_num]
+            page_tables.append(page.extract_tables())
+            # Release pdfplumber's per-page caches once the page is done
+            page.flush_cache()
+    return page_tables
+
+
+def _find_master_columns(master_df: pd.DataFrame) -> tuple:
+    """
+    Determine the product name and ID columns in the vendor master file.
+    
+    Args:
+        master_df: DataFrame containing vendor master products
+        
+    Returns:
+        tuple: (product_name_col, id_col), either may be None if not found
+    """
+    # Determine product name column in master file
+    product_name_col = None
+    for col in ['Product Name', 'Name', 'Description', 'Product Description']:
+        if col in master_df.columns:
+            product_name_col = col
+            break
+    
+    if not product_name_col:
+        logger.warning("Could not find product name column in master file")
+    
+    # Determine ID column in master file
+    id_col = None
+    for col in ['Internal ID', 'ID', 'Product ID', 'SKU', 'Product Number']:
+        if col in master_df.columns:
+            id_col = col
+            break
+    
+    if not id_col:
+        logger.warning("Could not find ID column in master file")
+    
+    return product_name_col, id_col
+
+
+@lru_cache(maxsize=4)
+def _load_vendor_master(path: str, mtime: float) -> Optional[tuple]:
+    """
+    Load the vendor master file and pre-compute its matching structures.
+    
+    Cached per (path, mtime), so every invoice matched against the same master
+    skips the CSV parse and name normalization; saving the file changes its
+    mtime and the next call reloads it. Callers must treat the result as read-only.
+    
+    Args:
+        path: Path to vendor master CSV file
+        mtime: Modification time of the file (part of the cache key)
+        
+    Returns:
+        tuple: (names_arr, ids_arr, size_groups, exact_map, sku_map), or None if
+               the master has no rows or no usable product name / ID columns
+    """
+    # Read SKUs as text, so a column with blanks doesn't turn "222" into "222.0"
+    master_df = pd.read_csv(path, dtype={'SKU': str})
+    product_name_col, id_col = _find_master_columns(master_df)
+    
+    if not product_name_col or not id_col or master_df.empty:
+        return None
+    
+    # Normalize product names once, so fuzzy scoring never re-processes them.
+    # Plain object arrays keep pandas indexing out of the matching path.
+    names_arr = master_df[product_name_col].astype(str).map(default_process).to_numpy(dtype=object)
+    ids_arr = master_df[id_col].astype(str).to_numpy(dtype=object)
+    
+    # Group master row positions by size, so items look up their candidates
+    size_col = None
+    size_groups = {}
+    for col in ['Size (ml)', 'Normalized Size']:
+        if col in master_df.columns:
+            size_col = col
+            size_groups = master_df.groupby(col).indices
+            break
+    
+    # Exact-match fast paths that skip fuzzy scoring. Names are keyed by
+    # (size, name) for size-filtered lookups and (None, name) for the full master;
+    # the first row wins, like the fuzzy tie-break.
+    exact_map = {}
+    sizes = master_df[size_col].tolist() if size_col else [None] * len(master_df)
+    for name, row_id, size in zip(names_arr, ids_arr, sizes):
+        if not name:
+            continue
+        exact_map.setdefault((None, name), row_id)
+        if size_col:
+            exact_map.setdefault((size, name), row_id)
+    
+    sku_map = {}
+    if 'SKU' in master_df.columns:
+        has_sku = master_df['SKU'].notna().to_numpy()
+        for sku, row_id in zip(master_df.loc[has_sku, 'SKU'].astype(str), ids_arr[has_sku]):
+            sku_map.setdefault(sku.strip(), row_id)
+    
+    return names_arr, ids_arr, size_groups, exact_map, sku_map
+
 
 class InvoiceIngester:
     """Handles invoice file ingestion with support for CSV and PDF formats."""
@@ -27,9 +195,22 @@ class InvoiceIngester:
         'Product Description'
     ]
     
+    # Parse-time dtypes for Fintech CSV columns. Vendor names repeat on every row;
+    # numeric columns are left to inference so prices stay full-precision floats.
+    FINTECH_DTYPES = {
+        'Vendor Name': 'category',
+        'Process Date': 'string',
+        'Invoice Number': 'string',
+        'Product Number': 'string',
+        'Product Description': 'string'
+    }
+    
     # Minimum fuzzy match score for PDF product matching
     MIN_MATCH_SCORE = 85
     
+    # PDFs with fewer pages than this are extracted in-process (worker startup isn't worth it)
+    PARALLEL_MIN_PAGES = 8
+    
     def process_fintech_csv(self, file) -> pd.DataFrame:
         """
         Process CSV file from Fintech (Fast Lane).
@@ -45,25 +226,41 @@ class InvoiceIngester:
             Exception: For other processing errors
         """
         try:
-            # Load CSV into pandas
-            df = pd.read_csv(file)
+            # Read just the header row to validate required columns cheaply
+            header_df = pd.read_csv(file, nrows=0)
             
             # Validate required columns exist
-            missing_cols = [col for col in self.FINTECH_REQUIRED_COLUMNS if col not in df.columns]
+            missing_cols = [col for col in self.FINTECH_REQUIRED_COLUMNS if col not in header_df.columns]
             if missing_cols:
                 raise ValueError(
                     f"Missing required columns in CSV: {', '.join(missing_cols)}. "
-                    f"Available columns: {', '.join(df.columns)}"
+                    f"Available columns: {', '.join(header_df.columns)}"
                 )
             
-            # Filter to keep only required columns
-            df_filtered = df[self.FINTECH_REQUIRED_COLUMNS].copy()
+            # Load only the required columns with the multithreaded PyArrow reader
+            file.seek(0)
+            df_filtered = pd.read_csv(
+                file,
+                engine='pyarrow',
+                usecols=self.FINTECH_REQUIRED_COLUMNS,
+                dtype=self.FINTECH_DTYPES
+            )[self.FINTECH_REQUIRED_COLUMNS]
             
             # Clean Process Date column (remove timestamps, keep YYYY-MM-DD)
             if 'Process Date' in df_filtered.columns:
-                df_filtered['Process Date'] = df_filtered['Process Date'].apply(
-                    self._clean_date
-                )
+                raw_dates = df_filtered['Process Date']
+                # Parse the whole column in one vectorized call
+                parsed = pd.to_datetime(raw_dates, errors='coerce', format='mixed')
+                if pd.api.types.is_datetime64_any_dtype(parsed):
+                    cleaned = parsed.dt.strftime('%Y-%m-%d')
+                    # Only values pandas couldn't parse go through the per-value cleaner
+                    unparsed = cleaned.isna()
+                    if unparsed.any():
+                        cleaned.loc[unparsed] = raw_dates[unparsed].map(self._clean_date)
+                else:
+                    # Mixed timezone offsets can't share one datetime dtype
+                    cleaned = raw_dates.map(self._clean_date)
+                df_filtered['Process Date'] = cleaned
             
             logger.info(f"Successfully processed Fintech CSV: {len(df_filtered)} rows")
             return df_filtered
@@ -99,15 +296,18 @@ class InvoiceIngester:
             Exception: For other processing errors
         """
         try:
-            # Extract data from PDF
-            extracted_data = self._extract_pdf_data(file)
+            # Extract data from PDF (streamed page by page; matching needs every item)
+            extracted_data = list(self._extract_pdf_data(file))
             
             if not extracted_data:
                 raise ValueError("Could not extract any data from PDF invoice.")
             
-            # Load vendor master file
+            # Load vendor master file (cached until the file changes)
             try:
-                master_df = pd.read_csv(vendor_master_file_path)
+                master = _load_vendor_master(
+                    vendor_master_file_path,
+                    os.path.getmtime(vendor_master_file_path)
+                )
             except FileNotFoundError:
                 raise FileNotFoundError(
                     f"Vendor master file not found: {vendor_master_file_path}"
@@ -115,31 +315,29 @@ class InvoiceIngester:
             except Exception as e:
                 raise ValueError(f"Error loading vendor master file: {str(e)}")
             
-            # Normalize sizes and match products
-            result_rows = []
-            for item in extracted_data:
-                matched_id = self._match_product(
-                    item,
-                    master_df,
+            matched_ids = [None] * len(extracted_data)
+            
+            if master is not None:
+                # Match every item against the master in batched fuzzy-scoring calls
+                matched_ids = self._match_products(
+                    extracted_data,
+                    master,
                     min_score=self.MIN_MATCH_SCORE
                 )
-                
-                # Create result row with extracted data + matched ID
-                result_row = {
-                    'Invoice Number': item.get('invoice_number', ''),
-                    'Invoice Date': item.get('invoice_date', ''),
-                    'SKU': item.get('sku', ''),
-                    'Description': item.get('description', ''),
-                    'Quantity': item.get('quantity', ''),
-                    'Unit Price': item.get('unit_price', ''),
-                    'Normalized Size (ml)': item.get('normalized_size', ''),
-                    'Matched Internal ID': matched_id if matched_id else 'No Match'
-                }
-                result_rows.append(result_row)
             
-            result_df = pd.DataFrame(result_rows)
+            # Build the result column by column (extracted data + matched ID)
+            result_df = pd.DataFrame({
+                'Invoice Number': [item.get('invoice_number', '') for item in extracted_data],
+                'Invoice Date': [item.get('invoice_date', '') for item in extracted_data],
+                'SKU': [item.get('sku', '') for item in extracted_data],
+                'Description': [item.get('description', '') for item in extracted_data],
+                'Quantity': [item.get('quantity', '') for item in extracted_data],
+                'Unit Price': [item.get('unit_price', '') for item in extracted_data],
+                'Normalized Size (ml)': [item.get('normalized_size', '') for item in extracted_data],
+                'Matched Internal ID': [matched_id if matched_id else 'No Match' for matched_id in matched_ids]
+            })
             logger.info(f"Successfully processed PDF invoice: {len(result_df)} items, "
-                       f"{len([r for r in result_rows if r['Matched Internal ID'] != 'No Match'])} matches")
+                       f"{sum(1 for matched_id in matched_ids if matched_id)} matches")
             
             return result_df
             
@@ -160,131 +358,184 @@ class InvoiceIngester:
         if pd.isna(date_value):
             return ''
         
-        # Convert to string if not already
-        date_str = str(date_value)
+        # Convert to string if not already (also makes the value hashable for the cache)
+        return _clean_date_str(str(date_value))
+    
+    def _extract_pdf_header(self, file) -> tuple:
+        """
+        Extract invoice number and date from the first page of a PDF.
         
-        # Try parsing with pandas (handles various formats)
-        try:
-            parsed_date = pd.to_datetime(date_str)
-            return parsed_date.strftime('%Y-%m-%d')
-        except:
-            # If parsing fails, try simple regex extraction
-            # Look for YYYY-MM-DD pattern
-            date_match = re.search(r'(\d{4}-\d{2}-\d{2})', date_str)
-            if date_match:
-                return date_match.group(1)
+        Header extraction is plain text only, so it uses PyMuPDF when installed
+        and falls back to pdfplumber otherwise. The file is rewound afterwards.
+        
+        Args:
+            file: File-like object or BytesIO containing PDF data
             
-            # Return original if we can't parse
-            return date_str.strip()
+        Returns:
+            tuple: (invoice_number, invoice_date), either may be None
+        """
+        invoice_number = None
+        invoice_date = None
+        text = ''
+        
+        try:
+            if PYMUPDF_AVAILABLE:
+                with fitz.open(stream=file.read(), filetype='pdf') as doc:
+                    if doc.page_count > 0:
+                        text = doc.load_page(0).get_text("text")
+            else:
+                with pdfplumber.open(file) as pdf:
+                    if len(pdf.pages) > 0:
+                        text = pdf.pages[0].extract_text() or ''
+        finally:
+            file.seek(0)
+        
+        # Extract invoice number (common patterns)
+        invoice_num_match = _INVOICE_NUM_RE.search(text)
+        if invoice_num_match:
+            invoice_number = invoice_num_match.group(1).strip()
+        
+        # Extract invoice date (common patterns)
+        date_match = _DATE_RE.search(text)
+        if date_match:
+            invoice_date = date_match.group(1).strip()
+        
+        return invoice_number, invoice_date
     
-    def _extract_pdf_data(self, file) -> list:
+    def _extract_pdf_data(self, file) -> Iterator[dict]:
         """
         Extract invoice data from PDF.
         
+        A generator: items are yielded page by page, so only one page's raw
+        tables are held in memory at a time.
+        
         Args:
             file: File-like object or BytesIO containing PDF data
             
-        Returns:
-            list: List of dictionaries containing extracted invoice items
+        Yields:
+            dict: Extracted invoice item
         """
-        extracted_items = []
-        
         try:
-            # Read PDF with pdfplumber
-            with pdfplumber.open(file) as pdf:
-                invoice_number = None
-                invoice_date = None
-                
-                # Extract header information (invoice number, date) from first page
-                if len(pdf.pages) > 0:
-                    first_page = pdf.pages[0]
-                    text = first_page.extract_text()
+            # Extract header information (invoice number, date) from first page
+            invoice_number, invoice_date = self._extract_pdf_header(file)
+            
+            # Extract table data from all pages (in parallel for long invoices)
+            pdf_bytes = file.read()
+            for tables in self._extract_page_tables(pdf_bytes):
+                for table in tables:
+                    if not table or len(table) < 2:
+                        continue
+                    
+                    # Assume first row is header, try to identify column positions
+                    header_row = table[0]
                     
-                    # Extract invoice number (common patterns)
-                    invoice_num_match = re.search(
-                        r'(?:Invoice\s*#?|Invoice\s*Number|INVOICE\s*NO\.?)\s*:?\s*([A-Z0-9\-]+)',
-                        text,
-                        re.IGNORECASE
-                    )
-                    if invoice_num_match:
-                        invoice_number = invoice_num_match.group(1).strip()
+                    # Normalize header cells once; every column lookup below reuses them
+                    header_cells = self._normalize_header(header_row)
                     
-                    # Extract invoice date (common patterns)
-                    date_match = re.search(
-                        r'(?:Date|Invoice\s*Date)\s*:?\s*(\d{1,2}[/\-]\d{1,2}[/\-]\d{2,4})',
-                        text,
-                        re.IGNORECASE
-                    )
-                    if date_match:
-                        invoice_date = date_match.group(1).strip()
-                
-                # Extract table data from all pages
-                for page_num, page in enumerate(pdf.pages):
-                    tables = page.extract_tables()
+                    # Find column indices (flexible matching)
+                    sku_idx = self._find_column_index(header_cells, ['sku', 'item', 'product number', 'code'])
+                    desc_idx = self._find_column_index(header_cells, ['description', 'product', 'item description'])
+                    qty_idx = self._find_column_index(header_cells, ['qty', 'quantity', 'qty.', 'qty:'])
+                    price_idx = self._find_column_index(header_cells, ['price', 'unit price', 'unit cost', 'cost'])
+                    size_idx = self._find_column_index(header_cells, ['size', 'volume', 'ml', 'ml:', 'size (ml)'])
                     
-                    for table in tables:
-                        if not table or len(table) < 2:
+                    # Get max index for validation (the same for every row of the table)
+                    indices = [idx for idx in [sku_idx, desc_idx, qty_idx, price_idx] if idx is not None]
+                    max_idx = max(indices) if indices else 0
+                    
+                    # Process data rows
+                    for row in table[1:]:
+                        if not row or len(row) <= max_idx:
                             continue
                         
-                        # Assume first row is header, try to identify column positions
-                        header_row = table[0]
+                        sku = self._safe_get(row, sku_idx, '').strip()
+                        description = self._safe_get(row, desc_idx, '').strip()
+                        quantity = self._safe_get(row, qty_idx, '').strip()
+                        unit_price = self._safe_get(row, price_idx, '').strip()
+                        size = self._safe_get(row, size_idx, '').strip()
                         
-                        # Find column indices (flexible matching)
-                        sku_idx = self._find_column_index(header_row, ['sku', 'item', 'product number', 'code'])
-                        desc_idx = self._find_column_index(header_row, ['description', 'product', 'item description'])
-                        qty_idx = self._find_column_index(header_row, ['qty', 'quantity', 'qty.', 'qty:'])
-                        price_idx = self._find_column_index(header_row, ['price', 'unit price', 'unit cost', 'cost'])
-                        size_idx = self._find_column_index(header_row, ['size', 'volume', 'ml', 'ml:', 'size (ml)'])
+                        # Skip empty rows
+                        if not description and not sku:
+                            continue
                         
-                        # Process data rows
-                        for row in table[1:]:
-                            # Get max index for validation
-                            indices = [idx for idx in [sku_idx, desc_idx, qty_idx, price_idx] if idx is not None]
-                            max_idx = max(indices) if indices else 0
-                            if not row or len(row) <= max_idx:
-                                continue
-                            
-                            sku = self._safe_get(row, sku_idx, '').strip()
-                            description = self._safe_get(row, desc_idx, '').strip()
-                            quantity = self._safe_get(row, qty_idx, '').strip()
-                            unit_price = self._safe_get(row, price_idx, '').strip()
-                            size = self._safe_get(row, size_idx, '').strip()
-                            
-                            # Skip empty rows
-                            if not description and not sku:
-                                continue
-                            
-                            # Normalize size
-                            normalized_size = self._normalize_size(size if size else description)
-                            
-                            extracted_items.append({
-                                'invoice_number': invoice_number,
-                                'invoice_date': invoice_date,
-                                'sku': sku,
-                                'description': description,
-                                'quantity': quantity,
-                                'unit_price': unit_price,
-                                'size': size,
-                                'normalized_size': normalized_size
-                            })
-        
+                        # Normalize size
+                        normalized_size = self._normalize_size(size if size else description)
+                        
+                        yield {
+                            'invoice_number': invoice_number,
+                            'invoice_date': invoice_date,
+                            'sku': sku,
+                            'description': description,
+                            'quantity': quantity,
+                            'unit_price': unit_price,
+                            'size': size,
+                            'normalized_size': normalized_size
+                        }
+    
         except Exception as e:
             logger.error(f"Error extracting PDF data: {str(e)}")
             raise ValueError(f"Failed to extract data from PDF: {str(e)}")
+    
+    def _extract_page_tables(self, pdf_bytes: bytes) -> Iterator[list]:
+        """
+        Extract raw tables from every page of a PDF.
+        
+        Long PDFs are split into contiguous page ranges that are extracted in
+        worker processes, since table extraction dominates the per-page cost.
+        
+        Args:
+            pdf_bytes: Raw PDF content
+            
+        Yields:
+            list: The tables of one page, in page order
+        """
+        n_workers = min(os.cpu_count() or 1, MAX_PDF_WORKERS)
         
-        return extracted_items
+        with pdfplumber.open(BytesIO(pdf_bytes)) as pdf:
+            n_pages = len(pdf.pages)
+            if n_pages < self.PARALLEL_MIN_PAGES or n_workers < 2:
+                for page in pdf.pages:
+                    yield page.extract_tables()
+                    # Release pdfplumber's per-page caches once the page is done
+                    page.flush_cache()
+                return
+        
+        bounds = np.linspace(0, n_pages, n_workers + 1).astype(int).tolist()
+        pages_done = 0
+        
+        try:
+            # Spawn, not fork: forking the threaded Streamlit server can copy a lock
+            # another thread holds (e.g. logging's) and hang the worker
+            with ProcessPoolExecutor(max_workers=n_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+                chunks = executor.map(_extract_tables_in_range, repeat(pdf_bytes), bounds[:-1], bounds[1:])
+                for chunk in chunks:
+                    for page_tables in chunk:
+                        yield page_tables
+                        pages_done += 1
+        except Exception as e:
+            # Process pools can be unavailable (e.g. restricted hosts) - finish in-process
+            logger.warning(f"Parallel PDF table extraction failed, falling back to sequential: {str(e)}")
+            yield from _extract_tables_in_range(pdf_bytes, pages_done, n_pages)
     
-    def _find_column_index(self, header_row: list, search_terms: list) -> Optional[int]:
-        """Find column index by searching for keywords in header row."""
+    def _normalize_header(self, header_row: list) -> list:
+        """Lower-case and strip non-empty header cells, keeping their column index."""
         if not header_row:
-            return None
+            return []
         
-        for idx, cell in enumerate(header_row):
-            if cell:
-                cell_lower = str(cell).lower().strip()
-                for term in search_terms:
-                    if term.lower() in cell_lower:
-                        return idx
+        return [(idx, str(cell).lower().strip()) for idx, cell in enumerate(header_row) if cell]
+    
+    def _find_column_index(self, header_cells: list, search_terms: list) -> Optional[int]:
+        """
+        Find column index by searching for keywords in a normalized header row.
+        
+        Args:
+            header_cells: (index, normalized cell) pairs from _normalize_header
+            search_terms: Lower-case keywords; the first cell containing any of them wins
+        """
+        for idx, cell_lower in header_cells:
+            for term in search_terms:
+                if term in cell_lower:
+                    return idx
         
         return None
     
@@ -295,11 +546,14 @@ class InvoiceIngester:
         value = row[index]
         return str(value) if value is not None else default
     
-    def _normalize_size(self, size_str: str) -> Optional[int]:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _normalize_size(size_str: str) -> Optional[int]:
         """
         Normalize size string to integer (ml).
         
         Converts sizes like "750ML", "1 L", "750 ml" to integers (750, 1000, 750).
+        Memoized, since the same few sizes repeat across invoice lines.
         
         Args:
             size_str: Size string to normalize
@@ -314,111 +568,125 @@ class InvoiceIngester:
         size_str = str(size_str).upper().strip()
         
         # Remove common prefixes/suffixes
-        size_str = re.sub(r'[^\d.\sLMKGT]', '', size_str)
-        
-        # Pattern matching for various formats
-        # Match: "750ML", "750 ML", "750ml" -> 750
-        ml_match = re.search(r'(\d+(?:\.\d+)?)\s*ML', size_str)
-        if ml_match:
-            return int(float(ml_match.group(1)))
-        
-        # Match: "1 L", "1.5L", "1L" -> convert to ml
-        liter_match = re.search(r'(\d+(?:\.\d+)?)\s*L', size_str)
-        if liter_match:
-            liters = float(liter_match.group(1))
+        size_str = _SIZE_STRIP_RE.sub('', size_str)
+        
+        # Single pass over the string: the first "<n> ML" wins outright, otherwise
+        # the first "<n> L", otherwise the first bare number
+        # Match: "750ML", "750 ML", "750ml" -> 750; "1 L", "1.5L", "1L" -> ml; "750" -> assume ml
+        liters = None
+        number = None
+        for size_match in _SIZE_RE.finditer(size_str):
+            value = float(size_match.group('num'))
+            unit = size_match.group('unit')
+            if unit == 'ML':
+                return int(value)
+            if unit == 'L':
+                if liters is None:
+                    liters = value
+            elif number is None:
+                number = value
+        
+        if liters is not None:
             return int(liters * 1000)
         
-        # Match: "750" (assume ml if no unit)
-        num_match = re.search(r'(\d+(?:\.\d+)?)', size_str)
-        if num_match:
+        if number is not None:
             # If number is > 100, assume ml; otherwise assume liters
-            value = float(num_match.group(1))
-            if value > 100:
-                return int(value)
+            if number > 100:
+                return int(number)
             else:
-                return int(value * 1000)
+                return int(number * 1000)
         
         return None
     
-    def _match_product(
+    def _match_products(
         self,
-        item: Dict[str, Any],
-        master_df: pd.DataFrame,
+        items: list,
+        master: tuple,
         min_score: int = 85
-    ) -> Optional[str]:
+    ) -> list:
         """
-        Match PDF item to vendor master file product.
+        Match PDF items to vendor master file products.
+        
+        Exact SKU matches, then exact normalized-name matches within the item's
+        size group, are resolved with dict lookups. Remaining items are grouped
+        by the normalized size their candidates are filtered to, and each group
+        is scored against its candidates in a single rapidfuzz.process.cdist call.
         
         Args:
-            item: Dictionary containing item data (description, normalized_size, etc.)
-            master_df: DataFrame containing vendor master products
+            items: List of item dictionaries (description, normalized_size, etc.)
+            master: Pre-computed vendor master structures from _load_vendor_master
             min_score: Minimum fuzzy match score (0-100)
             
         Returns:
-            Optional[str]: Matched internal ID, or None if no match found
+            list: Matched internal ID (or None if no match found) for each item, in order
         """
-        if master_df.empty:
-            return None
-        
-        item_description = item.get('description', '')
-        item_size = item.get('normalized_size')
-        
-        if not item_description:
-            return None
-        
-        # Filter master by normalized size if available
-        filtered_master = master_df.copy()
-        
-        if item_size is not None and 'Size (ml)' in master_df.columns:
-            # Filter to same size
-            filtered_master = filtered_master[
-                filtered_master['Size (ml)'] == item_size
-            ]
-        elif item_size is not None and 'Normalized Size' in master_df.columns:
-            filtered_master = filtered_master[
-                filtered_master['Normalized Size'] == item_size
-            ]
-        
-        if filtered_master.empty:
-            # No size match, use full master
-            filtered_master = master_df.copy()
-        
-        # Find best match using fuzzy string matching
-        best_score = 0
-        best_match_id = None
-        
-        # Determine product name column in master file
-        product_name_col = None
-        for col in ['Product Name', 'Name', 'Description', 'Product Description']:
-            if col in filtered_master.columns:
-                product_name_col = col
-                break
-        
-        if not product_name_col:
-            logger.warning("Could not find product name column in master file")
-            return None
-        
-        # Determine ID column in master file
-        id_col = None
-        for col in ['Internal ID', 'ID', 'Product ID', 'SKU', 'Product Number']:
-            if col in filtered_master.columns:
-                id_col = col
-                break
-        
-        if not id_col:
-            logger.warning("Could not find ID column in master file")
-            return None
-        
-        # Calculate fuzzy match scores
-        for _, master_row in filtered_master.iterrows():
-            master_product_name = str(master_row[product_name_col])
+        names_arr, ids_arr, size_groups, exact_map, sku_map = master
+        matched_ids = [None] * len(items)
+        
+        # Group (position, normalized query) by normalized size; sizes missing from
+        # the master share one bucket (None) that is compared against the full master
+        size_buckets: Dict[Optional[int], list] = {}
+        for pos, item in enumerate(items):
+            # Fast path: exact SKU match
+            sku = item.get('sku', '')
+            if sku and sku in sku_map:
+                matched_ids[pos] = sku_map[sku]
+                continue
+            
+            item_description = item.get('description', '')
+            if not item_description:
+                continue
+            
+            item_size = item.get('normalized_size')
+            if item_size not in size_groups:
+                item_size = None
+            
+            # Queries get the same normalization as the pre-processed choices
+            query = default_process(item_description)
             
+            # Fast path: exact normalized name among this item's candidates
+            exact_id = exact_map.get((item_size, query))
+            if exact_id is not None:
+                matched_ids[pos] = exact_id
+                continue
+            
+            size_buckets.setdefault(item_size, []).append((pos, query))
+        
+        for item_size, bucket in size_buckets.items():
+            # Filter master by normalized size with an O(1) group lookup
+            row_idx = size_groups.get(item_size) if item_size is not None else None
+            if row_idx is None or len(row_idx) == 0:
+                # Full master: score against the cached arrays themselves, no indexing
+                choices = names_arr
+                candidate_ids = ids_arr
+            else:
+                choices = names_arr[row_idx]
+                candidate_ids = ids_arr[row_idx]
+            # Invoices repeat descriptions, so score each distinct query only once
+            query_rows: Dict[str, int] = {}
+            for _, query in bucket:
+                query_rows.setdefault(query, len(query_rows))
+            queries = list(query_rows)
+            
+            # Score every query against every candidate in native code (all cores)
             # Use token_set_ratio for better matching (handles word order differences)
-            score = fuzz.token_set_ratio(item_description, master_product_name)
+            scores = process.cdist(
+                queries,
+                choices,
+                scorer=fuzz.token_set_ratio,
+                processor=None,
+                score_cutoff=min_score,
+                workers=-1
+            )
             
-            if score > best_score and score >= min_score:
-                best_score = score
-                best_match_id = str(master_row[id_col])
+            # First candidate with the highest score wins; scores below min_score are 0
+            best_idx = scores.argmax(axis=1)
+            best_score = scores[np.arange(len(queries)), best_idx]
+            best_ids = candidate_ids[best_idx]
+            
+            for pos, query in bucket:
+                row = query_rows[query]
+                if best_score[row] > 0 and best_score[row] >= min_score:
+                    matched_ids[pos] = best_ids[row]
         
-        return best_match_id
-
+        return matched_ids
@@ -12,7 +12,7 @@ st.set_page_config(
 )
 
 # Custom CSS
-st.markdown("""
+CUSTOM_CSS = """
     <style>
     .main-header {
         font-size: 2.5rem;
@@ -26,7 +26,8 @@ st.markdown("""
         padding: 2rem;
     }
     </style>
-""", unsafe_allow_html=True)
+"""
+st.html(CUSTOM_CSS)  # pure HTML - skips the Markdown parser
 
 st.markdown('<div class="info-container">', unsafe_allow_html=True)
 st.markdown('<h1 class="main-header">Password Reset</h1>', unsafe_allow_html=True)
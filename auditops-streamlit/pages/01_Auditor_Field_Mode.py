@@ -2,24 +2,21 @@
 Auditor Field Mode - Check in/out and manage shifts.
 """
 import streamlit as st
-from datetime import datetime, timezone
-from src.pin_auth import require_authentication, require_role, get_current_user
-from src.config import ROLE_AUDITOR, SHIFT_STATUS_DRAFT, SHIFT_STATUS_SUBMITTED
+from datetime import datetime, time, timezone
+from src.pin_auth import require_role
+from src.config import ROLE_AUDITOR, SHIFT_STATUS_DRAFT
 from src.db import (
     get_shifts_by_auditor, create_shift, update_shift, submit_shift,
     get_all_clients
 )
-from src.utils import format_datetime, format_duration, calculate_hours, get_client_display_name
+from src.field_mode_common import find_today_shifts
+from src.utils import format_datetime, format_duration, calculate_hours, get_client_display_name, run_in_parallel
 
 # Page config
 st.set_page_config(page_title="Field Mode", layout="wide")
 
 # Authentication and role check
-require_authentication()
-require_role(ROLE_AUDITOR)
-
-# Get current user
-user = get_current_user()
+user = require_role(ROLE_AUDITOR)
 auditor_id = user.get('id') if user else None
 
 if not auditor_id:
@@ -29,12 +26,36 @@ if not auditor_id:
 st.title("📱 Field Mode")
 st.markdown("Check in/out and manage your shifts.")
 
-# Get shifts and identify open_shift and submit_ready_shift
-today_utc = datetime.now(timezone.utc).date()
 
-# Add error handling for shift query
+# Cached reads - every widget interaction reruns the page, so these skip the
+# Supabase round-trips. The shift cache is cleared after every shift write.
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_shifts(auditor_id: str, since: str) -> list:
+    """The auditor's shifts checked in since `since`, cached for 30 seconds."""
+    return get_shifts_by_auditor(auditor_id, status=None, since=since)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_clients() -> list:
+    """All clients (active and inactive) with full profiles, cached for 5 minutes."""
+    return get_all_clients(active_only=False)
+
+
+# Get shifts and identify open_shift and submit_ready_shift
+# Read the clock once per run. A button click reruns the script, so this is also
+# the click time used for check-in/check-out.
+now_utc = datetime.now(timezone.utc)
+today_utc = now_utc.date()
+# Only today's shifts matter here, so filter in the query instead of fetching the full history
+today_start_iso = datetime.combine(today_utc, time.min, tzinfo=timezone.utc).isoformat()
+
+# Add error handling for shift query. The client list is fetched alongside it,
+# so the two round-trips overlap.
 try:
-    all_shifts = get_shifts_by_auditor(auditor_id, status=None)
+    all_shifts, all_clients = run_in_parallel(
+        lambda: _cached_shifts(auditor_id, today_start_iso),
+        _cached_clients,
+    )
 except Exception as e:
     st.error(f"⚠️ Error loading shifts: {str(e)}")
 
@@ -51,32 +72,89 @@ except Exception as e:
 
     st.stop()
 
-# Process shifts to find open_shift and submit_ready_shift
-open_shift = None
-submit_ready_shift = None
-
-def safe_parse_iso(value):
-    """Safely parse ISO datetime string."""
-    if not value:
-        return None
-    try:
-        return datetime.fromisoformat(value.replace("Z", "+00:00"))
-    except Exception:
-        return None
-
-for shift in all_shifts:
-    check_in_str = shift.get("check_in")
-    check_in_dt = safe_parse_iso(check_in_str)
-    check_in_date = check_in_dt.date() if check_in_dt else None
-    
-    if check_in_date == today_utc:
-        status = shift.get("status")
-        check_out = shift.get("check_out")
-        
-        if status in [SHIFT_STATUS_DRAFT, SHIFT_STATUS_SUBMITTED] and not check_out:
-            open_shift = shift
-        elif status == SHIFT_STATUS_DRAFT and check_out:
-            submit_ready_shift = shift
+# One client fetch serves both the open shift's profile (any client) and the
+# check-in form (active clients only)
+clients_by_id = {c["id"]: c for c in all_clients}
+active_clients = [c for c in all_clients if c.get("is_active")]
+
+# Find today's open_shift and submit_ready_shift
+open_shift, submit_ready_shift = find_today_shifts(all_shifts, today_utc)
+
+
+@st.fragment
+def check_in_form(clients: list):
+    """
+    Check-in form.
+
+    Runs as a fragment, so a rejected submission reruns only the form.
+    A successful check-in triggers a full rerun to show the new shift.
+    """
+    with st.form("check_in_form"):
+        st.subheader("Check In")
+        # One pass: name -> full client row (the id and the details both come from it)
+        client_by_name = {c["name"]: c for c in clients}
+        client_names = list(client_by_name)
+
+        if not client_names:
+            st.warning("No active clients available. Contact an administrator.")
+            selected_client = None
+            notes = ""
+            # Always include submit button (disabled when no clients)
+            st.form_submit_button("✅ Check In", type="primary", use_container_width=True, disabled=True)
+        else:
+            # index=None starts with nothing selected (returns None) - no "" sentinel option
+            selected_client = st.selectbox(
+                "Select Client", client_names, index=None, placeholder="Select a client..."
+            )
+
+            # Show client details when selected
+            if selected_client:
+                st.markdown("---")
+                st.markdown("### 📋 Client Information")
+                # Get full client details
+                client_detail = client_by_name.get(selected_client)
+                if client_detail:
+                    st.markdown(f"**Name:** {client_detail.get('name', 'N/A')}")
+                    st.markdown(f"**Address:** {client_detail.get('address', 'N/A')}")
+
+                    if client_detail.get('wifi_name'):
+                        st.markdown(f"**WiFi:** {client_detail.get('wifi_name')}")
+                        if client_detail.get('wifi_password'):
+                            st.markdown(f"**WiFi Password:** {client_detail.get('wifi_password')}")
+
+                    if client_detail.get('special_instructions'):
+                        st.info(f"**Special Instructions:** {client_detail.get('special_instructions')}")
+
+                    # Show hint about site codes
+                    st.caption("💡 Site access codes (alarm, lockbox, etc.) available after check-in")
+                st.markdown("---")
+
+            notes = st.text_area("Notes (optional)", placeholder="Add any notes about this shift...")
+
+            if st.form_submit_button("✅ Check In", type="primary", use_container_width=True):
+                if not selected_client:
+                    st.error("Please select a client.")
+                else:
+                    client_id = client_by_name[selected_client]["id"]
+                    # A fragment rerun doesn't refresh now_utc, so read the clock here
+                    check_in_time = datetime.now(timezone.utc)
+
+                    shift_data = {
+                        "auditor_id": auditor_id,
+                        "client_id": client_id,
+                        "check_in": check_in_time.isoformat(),
+                        "status": SHIFT_STATUS_DRAFT,
+                        "notes": notes if notes else None
+                    }
+
+                    result = create_shift(shift_data)
+                    if result:
+                        _cached_shifts.clear()
+                        st.success("Checked in successfully!")
+                        st.rerun(scope="app")
+                    else:
+                        st.error("Failed to check in. Please try again.")
+
 
 # Main content area
 st.subheader("Current Shift")
@@ -96,8 +174,7 @@ if open_shift:
     # Get full client details
     client_id = open_shift.get("client_id")
     if client_id:
-        all_clients = get_all_clients(active_only=False)
-        client_detail = next((c for c in all_clients if c["id"] == client_id), None)
+        client_detail = clients_by_id.get(client_id)
 
         if client_detail:
             with st.expander(f"📋 **{client_detail.get('name', 'Client')} - Full Profile**", expanded=True):
@@ -158,7 +235,7 @@ if open_shift:
 
     # Check out button
     if st.button("🛑 Check Out", type="primary", use_container_width=True):
-        check_out_time = datetime.now(timezone.utc)
+        check_out_time = now_utc
         hours = calculate_hours(open_shift.get("check_in"), check_out_time)
 
         update_data = {
@@ -170,6 +247,7 @@ if open_shift:
 
         result = update_shift(open_shift["id"], update_data)
         if result:
+            _cached_shifts.clear()
             st.success("Checked out successfully!")
             st.rerun()
         else:
@@ -186,6 +264,7 @@ elif submit_ready_shift:
     if st.button("📤 Submit for Approval", use_container_width=True):
         result = submit_shift(submit_ready_shift["id"])
         if result:
+            _cached_shifts.clear()
             st.success("Shift submitted for approval!")
             st.rerun()
         else:
@@ -193,66 +272,4 @@ elif submit_ready_shift:
 else:
     st.info("No active shift. Check in to start a new shift.")
 
-    # Check in form
-    with st.form("check_in_form"):
-        st.subheader("Check In")
-        clients = get_all_clients(active_only=True)
-        client_options = {c["name"]: c["id"] for c in clients}
-        client_names = list(client_options.keys())
-
-        if not client_names:
-            st.warning("No active clients available. Contact an administrator.")
-            selected_client = None
-            notes = ""
-            # Always include submit button (disabled when no clients)
-            st.form_submit_button("✅ Check In", type="primary", use_container_width=True, disabled=True)
-        else:
-            selected_client = st.selectbox("Select Client", [""] + client_names)
-
-            # Show client details when selected
-            if selected_client:
-                st.markdown("---")
-                st.markdown("### 📋 Client Information")
-                selected_client_id = client_options[selected_client]
-
-                # Get full client details
-                client_detail = next((c for c in clients if c["id"] == selected_client_id), None)
-                if client_detail:
-                    st.markdown(f"**Name:** {client_detail.get('name', 'N/A')}")
-                    st.markdown(f"**Address:** {client_detail.get('address', 'N/A')}")
-
-                    if client_detail.get('wifi_name'):
-                        st.markdown(f"**WiFi:** {client_detail.get('wifi_name')}")
-                        if client_detail.get('wifi_password'):
-                            st.markdown(f"**WiFi Password:** {client_detail.get('wifi_password')}")
-
-                    if client_detail.get('special_instructions'):
-                        st.info(f"**Special Instructions:** {client_detail.get('special_instructions')}")
-
-                    # Show hint about site codes
-                    st.caption("💡 Site access codes (alarm, lockbox, etc.) available after check-in")
-                st.markdown("---")
-
-            notes = st.text_area("Notes (optional)", placeholder="Add any notes about this shift...")
-
-            if st.form_submit_button("✅ Check In", type="primary", use_container_width=True):
-                if not selected_client:
-                    st.error("Please select a client.")
-                else:
-                    client_id = client_options[selected_client]
-                    check_in_time = datetime.now(timezone.utc)
-
-                    shift_data = {
-                        "auditor_id": auditor_id,
-                        "client_id": client_id,
-                        "check_in": check_in_time.isoformat(),
-                        "status": SHIFT_STATUS_DRAFT,
-                        "notes": notes if notes else None
-                    }
-
-                    result = create_shift(shift_data)
-                    if result:
-                        st.success("Checked in successfully!")
-                        st.rerun()
-                    else:
-                        st.error("Failed to check in. Please try again.")
+    check_in_form(active_clients)
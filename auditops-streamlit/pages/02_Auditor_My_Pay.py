@@ -2,22 +2,16 @@
 Auditor My Pay - View pay history and statements.
 """
 import streamlit as st
-from src.pin_auth import require_authentication, require_role, get_current_user
+from src.pin_auth import require_role
 from src.config import ROLE_AUDITOR
 from src.db import get_pay_items_by_auditor, get_all_pay_periods
-from src.utils import format_date, format_currency, format_duration
-from src.pdf_statements import generate_pay_statement_pdf
-import pandas as pd
+from src.utils import format_date, format_currency, format_duration, run_in_parallel
 
 # Page config
 st.set_page_config(page_title="My Pay", layout="wide")
 
 # Authentication and role check
-require_authentication()
-require_role(ROLE_AUDITOR)
-
-# Get current user
-user = get_current_user()
+user = require_role(ROLE_AUDITOR)
 auditor_id = user.get('id') if user else None
 
 if not auditor_id:
@@ -27,14 +21,58 @@ if not auditor_id:
 st.title("💰 My Pay")
 st.markdown("View your pay history and download statements.")
 
-# Get pay items
-pay_items = get_pay_items_by_auditor(auditor_id)
-pay_periods = get_all_pay_periods()
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _cached_statement_pdf(auditor_name: str, pay_period: dict, pay_items: list) -> bytes:
+    """
+    Render a pay statement PDF, cached on its inputs so repeat clicks skip reportlab.
+
+    Changed pay items or a changed period hash differently, so they render a fresh PDF.
+    """
+    # reportlab is only needed once a statement is requested
+    from src.pdf_statements import generate_pay_statement_pdf
+
+    return generate_pay_statement_pdf(
+        auditor_name=auditor_name,
+        pay_period=pay_period,
+        pay_items=pay_items
+    ).getvalue()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_pay_items(auditor_id: str) -> list:
+    """All pay items for the auditor, cached for 60 seconds."""
+    return get_pay_items_by_auditor(auditor_id)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_pay_periods() -> list:
+    """All pay periods, cached for 60 seconds."""
+    return get_all_pay_periods()
+
+
+# Get pay items and pay periods - independent reads, so fetch them concurrently.
+# Both are cached, so changing the period filter doesn't go back to the database:
+# the totals need every item anyway and the filter runs in memory.
+pay_items, pay_periods = run_in_parallel(
+    lambda: _cached_pay_items(auditor_id),
+    _cached_pay_periods,
+)
 
 # Summary stats
 if pay_items:
-    total_hours = sum(float(item.get("hours", 0)) for item in pay_items)
-    total_amount = sum(float(item.get("amount", 0)) for item in pay_items)
+    # pandas is only imported when there is something to show
+    import pandas as pd
+
+    # One DataFrame for the summary and the period filter. The joined pay_period and
+    # shift records are flattened into dotted columns ("pay_period.id", "shift.check_in").
+    items_df = pd.json_normalize(pay_items)
+    # Missing or invalid values (or a missing column) count as 0
+    for column in ("hours", "amount", "rate"):
+        items_df[column] = pd.to_numeric(items_df[column], errors="coerce").fillna(0) if column in items_df else 0.0
+
+    total_hours = float(items_df["hours"].sum())
+    total_amount = float(items_df["amount"].sum())
     
     col1, col2, col3 = st.columns(3)
     with col1:
@@ -54,33 +92,48 @@ selected_period_id = st.selectbox("Filter by Pay Period", list(period_options.ke
 
 # Filter pay items
 filtered_items = pay_items
-if selected_period_id and selected_period_id != "None":
-    filtered_items = [item for item in pay_items if item.get("pay_period", {}).get("id") == selected_period_id]
+if pay_items:
+    filtered_df = items_df
+    if selected_period_id and selected_period_id != "None":
+        period_ids = items_df.get("pay_period.id")
+        filtered_df = items_df.iloc[0:0] if period_ids is None else items_df[period_ids.eq(selected_period_id)]
+        # json_normalize keeps the list order, so the index maps back to pay_items
+        filtered_items = [pay_items[i] for i in filtered_df.index]
+
+
+def _text_column(df, column: str):
+    """Column as display text, with missing values (or a missing column) shown as "—"."""
+    if column not in df:
+        return "—"
+    return df[column].fillna("—").astype(str)
+
 
 # Display table
 if filtered_items:
-    # Prepare data for table
-    table_data = []
-    for item in filtered_items:
-        period = item.get("pay_period") or {}
-        shift = item.get("shift") or {}
-        
-        table_data.append({
-            "Pay Period": f"{format_date(period.get('start_date'))} - {format_date(period.get('end_date'))}",
-            "Date": format_date(shift.get("check_in")),
-            "Hours": f"{float(item.get('hours', 0)):.2f}",
-            "Rate": format_currency(item.get("rate")),
-            "Amount": format_currency(item.get("amount"))
-        })
-    
-    df = pd.DataFrame(table_data)
-    st.dataframe(df, use_container_width=True, hide_index=True)
+    # Build the display columns column-wise from the normalised DataFrame
+    if "shift.check_in" in filtered_df:
+        check_in_dates = (
+            pd.to_datetime(filtered_df["shift.check_in"], format="ISO8601", utc=True, errors="coerce")
+            .dt.strftime("%Y-%m-%d")
+            .fillna("—")
+        )
+    else:
+        check_in_dates = "—"
+
+    # Column-oriented dict straight to st.dataframe - no row dicts or type inference
+    st.dataframe({
+        "Pay Period": _text_column(filtered_df, "pay_period.start_date") + " - " + _text_column(filtered_df, "pay_period.end_date"),
+        "Date": check_in_dates,
+        "Hours": filtered_df["hours"].map("{:.2f}".format),
+        "Rate": filtered_df["rate"].map(format_currency),
+        "Amount": filtered_df["amount"].map(format_currency),
+    }, use_container_width=True, hide_index=True)
     
     # Download statement for selected period
     if selected_period_id and selected_period_id != "None":
         st.subheader("Download Statement")
         period = next((p for p in pay_periods if p["id"] == selected_period_id), None)
-        period_items = [item for item in pay_items if item.get("pay_period", {}).get("id") == selected_period_id]
+        period_items = filtered_items
         
         if period and period_items:
             profile = st.session_state.get("user_profile", {})
@@ -88,16 +141,12 @@ if filtered_items:
             
             if st.button("📄 Generate PDF Statement", type="primary"):
                 with st.spinner("Generating PDF..."):
-                    pdf_buffer = generate_pay_statement_pdf(
-                        auditor_name=auditor_name,
-                        pay_period=period,
-                        pay_items=period_items
-                    )
+                    pdf_bytes = _cached_statement_pdf(auditor_name, period, period_items)
                     
                     period_label = f"{format_date(period.get('start_date'))}_{format_date(period.get('end_date'))}"
                     st.download_button(
                         label="⬇️ Download PDF",
-                        data=pdf_buffer.getvalue(),
+                        data=pdf_bytes,
                         file_name=f"pay_statement_{period_label}.pdf",
                         mime="application/pdf"
                     )
@@ -2,65 +2,96 @@
 Client Directory
 View all active clients with complete information.
 """
+import logging
 import streamlit as st
-from src.pin_auth import require_authentication, require_role, get_current_user
+from src.pin_auth import require_role
 from src.config import ROLE_AUDITOR
-from src.db import get_all_clients, get_client_secrets, log_secrets_access
+from src.db import get_all_clients, search_clients, get_client_secrets, log_secrets_access
 from datetime import datetime, timezone, timedelta
 
 # Page config
 st.set_page_config(page_title="Client Directory", page_icon="📂", layout="wide")
 
 # Authentication
-require_authentication()
-require_role(ROLE_AUDITOR)
-
-# Get current user
-user = get_current_user()
+user = require_role(ROLE_AUDITOR)
 auditor_id = user.get('id') if user else None
 
 st.title("📂 Client Directory")
 st.markdown("Browse all active clients and access site information.")
 st.markdown("---")
 
+# Clients per page of search results
+SEARCH_PAGE_SIZE = 50
+
 # Initialize session state for secrets
 if "directory_secrets_visible_until" not in st.session_state:
     st.session_state.directory_secrets_visible_until = {}
 if "directory_revealed_secrets" not in st.session_state:
     st.session_state.directory_revealed_secrets = {}
 
-# Get all active clients
-clients = get_all_clients(active_only=True)
 
-if not clients:
-    st.warning("No active clients found.")
-    st.info("Contact an administrator to add clients to the system.")
-else:
-    st.metric("Active Clients", len(clients))
-    st.markdown("---")
+@st.cache_data(ttl=60, show_spinner=False)
+def load_active_clients() -> list:
+    """
+    Active clients, cached for 60 seconds so reruns skip the query.
+
+    Secrets are never cached - every reveal fetches and logs.
+    """
+    return get_all_clients(active_only=True)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def load_search_results(search_lower: str, page: int) -> list:
+    """One page of matching active clients, searched in the database and cached for 30 seconds."""
+    return search_clients(search_lower, limit=SEARCH_PAGE_SIZE, offset=page * SEARCH_PAGE_SIZE)
+
+
+@st.fragment
+def client_search_fragment(clients: list):
+    """
+    Search box and client cards.
 
+    Runs as a fragment, so typing a search or revealing codes reruns only this
+    section - not the auth checks and client load above it.
+    """
     # Search bar
     search = st.text_input("🔍 Search clients", placeholder="Search by name, address, or contact...")
 
-    # Filter clients based on search
-    if search:
-        search_lower = search.lower()
-        filtered_clients = [
-            c for c in clients
-            if search_lower in c.get('name', '').lower()
-            or search_lower in c.get('address', '').lower()
-            or search_lower in c.get('contact_person', '').lower()
-        ]
+    # Search in the database, one page at a time; a new search starts at page 1
+    search_lower = search.strip().lower()
+    if search_lower:
+        if st.session_state.get("directory_search") != search_lower:
+            st.session_state.directory_search = search_lower
+            st.session_state.directory_search_page = 0
+        page = st.session_state.get("directory_search_page", 0)
+        filtered_clients = load_search_results(search_lower, page)
+
+        first = page * SEARCH_PAGE_SIZE + 1
+        if filtered_clients:
+            st.caption(f"Showing matches {first}-{first + len(filtered_clients) - 1}")
+        else:
+            st.caption("No matching clients")
+
+        prev_col, next_col = st.columns(2)
+        with prev_col:
+            if page > 0 and st.button("◀ Previous", key="directory_search_prev"):
+                st.session_state.directory_search_page = page - 1
+                st.rerun(scope="fragment")
+        with next_col:
+            if len(filtered_clients) == SEARCH_PAGE_SIZE and st.button("Next ▶", key="directory_search_next"):
+                st.session_state.directory_search_page = page + 1
+                st.rerun(scope="fragment")
     else:
         filtered_clients = clients
-
-    st.caption(f"Showing {len(filtered_clients)} of {len(clients)} clients")
+        st.caption(f"Showing {len(filtered_clients)} of {len(clients)} clients")
     st.markdown("---")
 
+    # One clock read per run is plenty for the 60-second reveal window
+    now_utc = datetime.now(timezone.utc)
+
     # Display clients in expandable cards
     for client in filtered_clients:
         client_id = client['id']
-        now_utc = datetime.now(timezone.utc)
 
         # Check if secrets are visible for this client
         secrets_visible_until = st.session_state.directory_secrets_visible_until.get(client_id)
@@ -69,80 +100,91 @@ else:
             and now_utc < secrets_visible_until
         )
 
-        # Clear expired secrets
+        # Drop expired secrets, so later runs find nothing to clear for this client
         if secrets_visible_until and now_utc >= secrets_visible_until:
-            st.session_state.directory_secrets_visible_until[client_id] = None
-            st.session_state.directory_revealed_secrets[client_id] = None
-
-        with st.expander(f"📍 {client['name']}", expanded=False):
+            st.session_state.directory_secrets_visible_until.pop(client_id, None)
+            st.session_state.directory_revealed_secrets.pop(client_id, None)
+
+        # Bind the card fields once instead of repeating client.get() per widget
+        get = client.get
+        name = client['name']
+        address = get('address', 'N/A')
+        (
+            contact_person, contact_email, contact_phone,
+            wifi_name, wifi_password,
+            alarm_code, lockbox_code, code_for_lights, cage_lock_code, patio_code,
+            audit_day, special_instructions, notes,
+        ) = map(get, (
+            'contact_person', 'contact_email', 'contact_phone',
+            'wifi_name', 'wifi_password',
+            'alarm_code', 'lockbox_code', 'code_for_lights', 'cage_lock_code', 'patio_code',
+            'audit_day', 'special_instructions', 'notes',
+        ))
+
+        with st.expander(f"📍 {name}", expanded=False):
             col1, col2 = st.columns([2, 1])
 
             with col1:
-                st.markdown(f"### {client['name']}")
-                st.markdown(f"**Address:** {client.get('address', 'N/A')}")
+                st.markdown(f"### {name}")
+                st.markdown(f"**Address:** {address}")
 
                 st.markdown("---")
                 st.markdown("**Contact Information:**")
-                if client.get('contact_person'):
-                    st.write(f"👤 {client.get('contact_person')}")
-                if client.get('contact_email'):
-                    st.write(f"📧 {client.get('contact_email')}")
-                if client.get('contact_phone'):
-                    st.write(f"📞 {client.get('contact_phone')}")
+                if contact_person:
+                    st.write(f"👤 {contact_person}")
+                if contact_email:
+                    st.write(f"📧 {contact_email}")
+                if contact_phone:
+                    st.write(f"📞 {contact_phone}")
 
                 # WiFi info if available
-                if client.get('wifi_name'):
+                if wifi_name:
                     st.markdown("---")
                     st.markdown("**WiFi Information:**")
-                    st.write(f"📶 Network: {client.get('wifi_name')}")
-                    if client.get('wifi_password'):
-                        st.write(f"🔑 Password: {client.get('wifi_password')}")
+                    st.write(f"📶 Network: {wifi_name}")
+                    if wifi_password:
+                        st.write(f"🔑 Password: {wifi_password}")
 
                 # Site Access Codes
-                has_codes = any([
-                    client.get('alarm_code'),
-                    client.get('lockbox_code'),
-                    client.get('code_for_lights'),
-                    client.get('cage_lock_code'),
-                    client.get('patio_code')
-                ])
+                has_codes = any((alarm_code, lockbox_code, code_for_lights, cage_lock_code, patio_code))
                 if has_codes:
                     st.markdown("---")
                     st.markdown("**Site Access Codes:**")
-                    if client.get('alarm_code'):
-                        st.write(f"🚨 Alarm Code: {client.get('alarm_code')}")
-                    if client.get('lockbox_code'):
-                        st.write(f"🔒 Lock Box Code: {client.get('lockbox_code')}")
-                    if client.get('code_for_lights'):
-                        st.write(f"💡 Code for Lights: {client.get('code_for_lights')}")
-                    if client.get('cage_lock_code'):
-                        st.write(f"🔐 CAGE LOCK/PAD LOCK: {client.get('cage_lock_code')}")
-                    if client.get('patio_code'):
-                        st.write(f"🏡 PATIO CODE: {client.get('patio_code')}")
+                    if alarm_code:
+                        st.write(f"🚨 Alarm Code: {alarm_code}")
+                    if lockbox_code:
+                        st.write(f"🔒 Lock Box Code: {lockbox_code}")
+                    if code_for_lights:
+                        st.write(f"💡 Code for Lights: {code_for_lights}")
+                    if cage_lock_code:
+                        st.write(f"🔐 CAGE LOCK/PAD LOCK: {cage_lock_code}")
+                    if patio_code:
+                        st.write(f"🏡 PATIO CODE: {patio_code}")
 
                 # Audit Schedule
-                if client.get('audit_day'):
+                if audit_day:
                     st.markdown("---")
                     st.markdown("**Audit Schedule:**")
-                    st.write(f"📅 Audit Day: {client.get('audit_day')}")
+                    st.write(f"📅 Audit Day: {audit_day}")
 
                 # Special instructions
-                if client.get('special_instructions'):
+                if special_instructions:
                     st.markdown("---")
                     st.markdown("**Special Instructions:**")
-                    st.info(client.get('special_instructions'))
+                    st.info(special_instructions)
 
                 # Notes
-                if client.get('notes'):
+                if notes:
                     st.markdown("---")
-                    st.markdown(f"**Notes:** {client.get('notes')}")
+                    st.markdown(f"**Notes:** {notes}")
 
             with col2:
                 st.markdown("### 🔐 Site Codes")
                 st.caption("Alarm codes, lockbox codes, and other secure information")
 
-                # Reveal secrets button
-                if st.button("🔓 Reveal Codes (60s)", key=f"reveal_{client_id}"):
+                # Reveal secrets button. While the codes are already showing there is
+                # nothing new to fetch or log, so a repeat click is a no-op.
+                if st.button("🔓 Reveal Codes (60s)", key=f"reveal_{client_id}") and not secrets_visible:
                     secrets = get_client_secrets(client_id)
                     if secrets is None:
                         st.warning("No secure codes available for this client.")
@@ -151,8 +193,10 @@ else:
                         st.session_state.directory_revealed_secrets[client_id] = secrets
                         st.session_state.directory_secrets_visible_until[client_id] = now_utc + timedelta(seconds=60)
                         fields_accessed = list(secrets.keys())
-                        log_secrets_access(client_id, auditor_id, fields_accessed, "Client Directory view")
-                        st.rerun()
+                        # Written before the rerun so every reveal has its audit record
+                        if not log_secrets_access(client_id, auditor_id, fields_accessed, "Client Directory view"):
+                            logging.error(f"Failed to log secrets access for client {client_id} by {auditor_id}")
+                        st.rerun(scope="fragment")
 
                 # Display secrets if visible
                 if secrets_visible:
@@ -178,3 +222,20 @@ else:
                     st.caption("Click button above to reveal codes")
 
             st.markdown("---")
+
+
+# Get all active clients
+clients = load_active_clients()
+
+if not clients:
+    st.warning("No active clients found.")
+    st.info("Contact an administrator to add clients to the system.")
+else:
+    st.metric("Active Clients", len(clients))
+    if st.button("🔄 Refresh", help="Reload the client list now instead of waiting for the cache to expire"):
+        load_active_clients.clear()
+        load_search_results.clear()
+        st.rerun()
+    st.markdown("---")
+
+    client_search_fragment(clients)
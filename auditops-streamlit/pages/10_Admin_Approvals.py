@@ -5,9 +5,9 @@ This page allows managers and admins to review and approve/reject submitted shif
 """
 import streamlit as st
 import logging
-from src.pin_auth import require_authentication, require_role, get_current_user
+from src.pin_auth import require_role
 from src.config import ROLE_MANAGER, ROLE_ADMIN, SHIFT_STATUS_SUBMITTED, SHIFT_STATUS_APPROVED, SHIFT_STATUS_REJECTED
-from src.db import get_submitted_shifts, get_shift, create_approval, get_approvals_by_shift
+from src.db import get_submitted_shifts, get_shift, create_approval, get_approvals_by_shifts
 from src.utils import format_datetime, format_duration, calculate_hours, get_client_display_name, get_user_display_name
 
 # Try to import diagnostic function (optional, for troubleshooting)
@@ -25,11 +25,7 @@ except Exception as e:
 st.set_page_config(page_title="Approvals", layout="wide")
 
 # Authentication and role check
-require_authentication()
-require_role([ROLE_MANAGER, ROLE_ADMIN])
-
-# Get current user
-user = get_current_user()
+user = require_role([ROLE_MANAGER, ROLE_ADMIN])
 approver_id = user.get('id') if user else None
 
 if not approver_id:
@@ -39,17 +35,40 @@ if not approver_id:
 st.title("✅ Approvals")
 st.markdown("Review and approve submitted shifts.")
 
+# Shifts whose approval history has been opened (history is loaded on demand)
+if "approvals_history_open" not in st.session_state:
+    st.session_state.approvals_history_open = set()
+
+
+@st.cache_data(ttl=15, show_spinner=False)
+def _cached_submitted_shifts() -> list:
+    """Submitted shifts, cached for 15 seconds. Cleared after every decision."""
+    return get_submitted_shifts()
+
+
 # Get submitted shifts
-submitted_shifts = get_submitted_shifts()
+submitted_shifts = _cached_submitted_shifts()
 
 if not submitted_shifts:
     st.info("No shifts pending approval.")
 else:
     st.metric("Pending Approvals", len(submitted_shifts))
+
+    # Approval history for the opened shifts in one batched query (None if it failed)
+    history_open = st.session_state.approvals_history_open
+    history_shift_ids = [shift["id"] for shift in submitted_shifts if shift["id"] in history_open]
+    approvals_by_shift = {}
+    if history_shift_ids:
+        try:
+            approvals_by_shift = get_approvals_by_shifts(history_shift_ids)
+        except Exception:
+            # Log error but don't crash the approval workflow
+            logging.exception("Failed to load approval history")
+            approvals_by_shift = None
     
     # Display shifts
     for shift in submitted_shifts:
-        with st.expander(f"Shift: {get_client_display_name(shift.get('client'))} - {get_user_display_name(shift.get('auditor'))}", expanded=True):
+        with st.expander(f"Shift: {get_client_display_name(shift.get('client'))} - {get_user_display_name(shift.get('auditor'))}", expanded=False):
             col1, col2 = st.columns([2, 1])
             
             with col1:
@@ -69,43 +88,48 @@ else:
             with col2:
                 st.markdown("**Status:** 🟡 SUBMITTED")
                 
-                # Approval actions using forms
-                with st.form(f"approve_form_{shift['id']}"):
-                    notes_approve = st.text_input("Approval notes (optional)", key=f"notes_approve_{shift['id']}", placeholder="Optional notes...")
-                    if st.form_submit_button("✅ Approve", use_container_width=True, type="primary"):
+                # Approval actions in one form per shift
+                with st.form(f"decision_{shift['id']}"):
+                    decision_notes = st.text_input("Decision notes", key=f"notes_{shift['id']}", placeholder="Optional for approval, required for rejection...")
+                    approve = st.form_submit_button("✅ Approve", use_container_width=True, type="primary")
+                    reject = st.form_submit_button("❌ Reject", use_container_width=True)
+                    if approve:
                         result = create_approval(
                             shift_id=shift["id"],
                             approver_id=approver_id,
                             decision="approved",
-                            notes=notes_approve if notes_approve else None
+                            notes=decision_notes if decision_notes else None
                         )
                         if result:
+                            _cached_submitted_shifts.clear()
                             st.success("Shift approved!")
                             st.rerun()
                         else:
                             st.error("Failed to approve shift.")
-                
-                with st.form(f"reject_form_{shift['id']}"):
-                    notes_reject = st.text_input("Rejection notes", key=f"notes_reject_{shift['id']}", placeholder="Required: reason for rejection...")
-                    if st.form_submit_button("❌ Reject", use_container_width=True):
-                        if not notes_reject:
+                    elif reject:
+                        if not decision_notes:
                             st.error("Please provide a reason for rejection.")
                         else:
                             result = create_approval(
                                 shift_id=shift["id"],
                                 approver_id=approver_id,
                                 decision="rejected",
-                                notes=notes_reject
+                                notes=decision_notes
                             )
                             if result:
+                                _cached_submitted_shifts.clear()
                                 st.success("Shift rejected.")
                                 st.rerun()
                             else:
                                 st.error("Failed to reject shift.")
             
-            # Show previous approvals (with error handling)
-            try:
-                approvals = get_approvals_by_shift(shift["id"])
+            # Show previous approvals (with error handling), only once requested
+            if shift["id"] not in history_open:
+                if st.button("📜 Show history", key=f"hist_{shift['id']}"):
+                    history_open.add(shift["id"])
+                    st.rerun()
+            elif approvals_by_shift is not None:
+                approvals = approvals_by_shift.get(shift["id"], [])
                 if approvals:
                     st.markdown("**Previous Decisions:**")
                     for approval in approvals:
@@ -119,9 +143,7 @@ else:
                             st.caption(f"  Notes: {notes}")
                 else:
                     st.caption("_No previous decisions_")
-            except Exception as e:
-                # Log error but don't crash the approval workflow
-                logging.exception(f"Failed to load approval history for shift {shift['id']}")
+            else:
                 st.warning("⚠️ Could not load approval history. You can still approve/reject this shift.")
 
                 # Add diagnostic button for troubleshooting (only show if diagnostics available)
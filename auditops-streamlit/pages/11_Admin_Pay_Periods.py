@@ -2,7 +2,7 @@
 Admin Pay Periods - Select and manage auto-generated pay periods.
 """
 import streamlit as st
-from datetime import date, timedelta, datetime
+from datetime import date, timedelta
 from src.pin_auth import require_authentication, require_role
 from src.config import ROLE_ADMIN, PAY_PERIOD_OPEN, PAY_PERIOD_LOCKED
 from src.db import (
@@ -23,11 +23,140 @@ st.title("📅 Pay Periods")
 st.markdown("Select and manage pay periods.")
 st.info("💡 **Recurring Schedule**: Pay periods run Saturday to Friday (14 days), with pay date the following Friday. First period: Dec 27, 2025 - Jan 9, 2026 → Pay: Jan 16, 2026")
 
+
+# Cached reads - every filter change reruns the page, so these skip
+# the Supabase round-trips. The period cache is cleared after a lock.
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_pay_periods() -> list:
+    """All pay periods, cached for 5 minutes - they are pre-generated and only change on a lock."""
+    return get_all_pay_periods(use_service_role=True)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _cached_period_items(period_id: str) -> list:
+    """Pay items for one period, cached for 60 seconds."""
+    return get_pay_items_by_period(period_id, use_service_role=True)
+
+
+@st.fragment
+def period_details(period_options: dict, default_index: int, periods_by_id: dict, current_period: dict | None):
+    """
+    Period selector, period details and pay items.
+
+    Runs as a fragment, so picking another period reruns only this section -
+    the period list, counts and filters above are not recomputed.
+    """
+    selected_period_id = st.selectbox(
+        "Select pay period to view details:",
+        list(period_options.keys()),
+        index=default_index,
+        format_func=lambda x: period_options[x]
+    )
+
+    st.markdown("---")
+
+    # Show selected period details
+    if selected_period_id:
+        selected_period = periods_by_id.get(selected_period_id)
+
+        if selected_period:
+            # Period info
+            col1, col2 = st.columns([2, 1])
+
+            with col1:
+                st.subheader("Period Information")
+                st.markdown(f"**Period:** {format_date(selected_period.get('start_date'))} to {format_date(selected_period.get('end_date'))}")
+                st.markdown(f"**Pay Date:** {format_date(selected_period.get('pay_date', 'N/A'))}")
+                st.markdown(f"**Status:** {selected_period.get('status', 'open').upper()}")
+
+                # Show if this is the current period
+                if current_period and selected_period.get("id") == current_period.get("id"):
+                    st.success("⭐ This is the current pay period")
+
+            with col2:
+                st.subheader("Actions")
+                if selected_period.get("status") == PAY_PERIOD_OPEN:
+                    if st.button("🔒 Lock Period", type="primary", use_container_width=True, key=f"lock_{selected_period_id}"):
+                        result = lock_pay_period(selected_period_id, use_service_role=True)
+                        if result:
+                            _cached_pay_periods.clear()
+                            st.success("✅ Pay period locked successfully!")
+                            # The period list and counts above change too
+                            st.rerun(scope="app")
+                        else:
+                            st.error("❌ Failed to lock period.")
+                    st.caption("Lock this period to prevent changes to pay items")
+                else:
+                    st.info("🔒 Period is locked")
+                    st.caption("Locked periods cannot be modified")
+
+            st.markdown("---")
+
+            # Pay items for this period
+            st.subheader("💰 Pay Items")
+            pay_items = _cached_period_items(selected_period_id)
+
+            if pay_items:
+                # One DataFrame for the summary and the table. The joined auditor profile
+                # is flattened into dotted columns ("auditor.full_name").
+                items_df = pd.json_normalize(pay_items)
+                # Missing or invalid values (or a missing column) count as 0
+                for column in ("hours", "amount", "rate"):
+                    items_df[column] = pd.to_numeric(items_df[column], errors="coerce").fillna(0) if column in items_df else 0.0
+
+                # Summary
+                total_hours = float(items_df["hours"].sum())
+                total_amount = float(items_df["amount"].sum())
+
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Total Hours", format_duration(total_hours))
+                with col2:
+                    st.metric("Total Amount", format_currency(total_amount))
+                with col3:
+                    st.metric("Employees", len(pay_items))
+
+                # Items table, built column-wise
+                st.dataframe({
+                    "Auditor": items_df["auditor.full_name"].fillna("Unknown") if "auditor.full_name" in items_df else "Unknown",
+                    "Hours": items_df["hours"].map("{:.2f}".format),
+                    "Rate": items_df["rate"].map(format_currency),
+                    "Amount": items_df["amount"].map(format_currency),
+                }, use_container_width=True, hide_index=True)
+
+                # Download summary PDF
+                st.markdown("---")
+                col1, col2 = st.columns([1, 3])
+                with col1:
+                    if st.button("📄 Generate Summary PDF", type="primary", use_container_width=True):
+                        with st.spinner("Generating PDF..."):
+                            pdf_buffer = generate_pay_period_summary_pdf(
+                                pay_period=selected_period,
+                                all_pay_items=pay_items
+                            )
+
+                            period_label = f"{format_date(selected_period.get('start_date'))}_{format_date(selected_period.get('end_date'))}"
+                            st.download_button(
+                                label="⬇️ Download PDF",
+                                data=pdf_buffer.getvalue(),
+                                file_name=f"pay_period_summary_{period_label}.pdf",
+                                mime="application/pdf",
+                                use_container_width=True
+                            )
+                with col2:
+                    st.caption("Generate a PDF summary of all pay items for this period")
+            else:
+                st.info("📭 No pay items for this period yet.")
+                st.caption("Pay items will appear here once shifts are approved and processed.")
+
+
 # Load all pay periods
-pay_periods = get_all_pay_periods(use_service_role=True)
+pay_periods = _cached_pay_periods()
 
 if not pay_periods:
-    # No pay periods exist - show setup instructions
+    # No pay periods exist - show setup instructions. Don't keep the empty result
+    # cached, so a refresh after running the setup script sees the new periods.
+    _cached_pay_periods.clear()
     st.warning("⚠️ **No pay periods found in database**")
 
     st.markdown("### 🚀 First Time Setup")
@@ -60,12 +189,24 @@ FROM pay_periods;
     st.info("📖 For detailed documentation, see: `sql_diagnostics/README_PAY_PERIODS.md`")
     st.stop()
 
-# Pay periods exist - show selection interface
+# Pay periods exist - index them once for O(1) lookups by id
+periods_by_id = {p["id"]: p for p in pay_periods}
+
+# Parse all period dates once, vectorized, for the current-period lookup and the
+# filters below. Unparseable dates become NaT, which never matches a comparison.
+periods_df = pd.DataFrame(pay_periods)
+period_statuses = periods_df["status"]
+period_starts = pd.to_datetime(periods_df["start_date"], utc=True, errors="coerce").dt.tz_localize(None).dt.normalize()
+period_ends = pd.to_datetime(periods_df["end_date"], utc=True, errors="coerce").dt.tz_localize(None).dt.normalize()
+
+# Show selection interface
 st.success(f"✅ **{len(pay_periods)} pay periods loaded**")
 
 # Summary stats
-open_count = sum(1 for p in pay_periods if p.get("status") == PAY_PERIOD_OPEN)
-locked_count = sum(1 for p in pay_periods if p.get("status") == PAY_PERIOD_LOCKED)
+open_mask = period_statuses == PAY_PERIOD_OPEN
+locked_mask = period_statuses == PAY_PERIOD_LOCKED
+open_count = int(open_mask.sum())
+locked_count = int(locked_mask.sum())
 
 col1, col2, col3 = st.columns(3)
 with col1:
@@ -79,28 +220,10 @@ st.markdown("---")
 
 # Find current pay period (based on today's date)
 today = date.today()
-current_period = None
-for period in pay_periods:
-    start_str = period.get("start_date")
-    end_str = period.get("end_date")
-
-    # Parse dates safely
-    try:
-        if isinstance(start_str, str):
-            start_date = datetime.fromisoformat(start_str.replace("Z", "+00:00")).date()
-        else:
-            start_date = start_str
-
-        if isinstance(end_str, str):
-            end_date = datetime.fromisoformat(end_str.replace("Z", "+00:00")).date()
-        else:
-            end_date = end_str
-
-        if start_date <= today <= end_date:
-            current_period = period
-            break
-    except Exception:
-        continue
+today_ts = pd.Timestamp(today)
+current_mask = (period_starts <= today_ts) & (period_ends >= today_ts)
+current_index = current_mask.idxmax() if current_mask.any() else None
+current_period = pay_periods[current_index] if current_index is not None else None
 
 # Filter options
 st.subheader("📋 Select Pay Period")
@@ -119,15 +242,15 @@ with filter_col2:
     # Search by date range
     search_enabled = st.checkbox("🔍 Search by date")
 
-# Apply filters
-filtered_periods = pay_periods.copy()
-
+# Apply filters as one boolean mask over the periods
 if filter_option == "Current Period" and current_period:
-    filtered_periods = [current_period]
+    filter_mask = periods_df.index == current_index
 elif filter_option == "Open Periods Only":
-    filtered_periods = [p for p in pay_periods if p.get("status") == PAY_PERIOD_OPEN]
+    filter_mask = open_mask
 elif filter_option == "Locked Periods Only":
-    filtered_periods = [p for p in pay_periods if p.get("status") == PAY_PERIOD_LOCKED]
+    filter_mask = locked_mask
+else:
+    filter_mask = pd.Series(True, index=periods_df.index)
 
 # Search by date
 if search_enabled:
@@ -138,20 +261,10 @@ if search_enabled:
         search_end = st.date_input("To date:", value=today + timedelta(days=30))
 
     # Filter by date range
-    temp_filtered = []
-    for period in filtered_periods:
-        try:
-            start_str = period.get("start_date")
-            if isinstance(start_str, str):
-                period_start = datetime.fromisoformat(start_str.replace("Z", "+00:00")).date()
-            else:
-                period_start = start_str
+    filter_mask = filter_mask & (period_starts >= pd.Timestamp(search_start)) & (period_starts <= pd.Timestamp(search_end))
 
-            if search_start <= period_start <= search_end:
-                temp_filtered.append(period)
-        except Exception:
-            continue
-    filtered_periods = temp_filtered
+# Back to the period dicts only for the rows that passed
+filtered_periods = [pay_periods[i] for i in periods_df.index[filter_mask]]
 
 if not filtered_periods:
     st.warning("No pay periods match your filter criteria.")
@@ -161,12 +274,15 @@ if not filtered_periods:
 if len(filtered_periods) < len(pay_periods):
     st.caption(f"Showing {len(filtered_periods)} of {len(pay_periods)} periods")
 
-# Create dropdown options
+# Create dropdown options, defaulting to the current period if it is listed.
+# Its position is noted while building, rather than searched for afterwards.
 period_options = {}
+default_index = 0
 for p in filtered_periods:
     period_label = f"{format_date(p.get('start_date'))} - {format_date(p.get('end_date'))}"
     if current_period and p.get("id") == current_period.get("id"):
         period_label = f"⭐ CURRENT: {period_label}"
+        default_index = len(period_options)
     elif p.get("status") == PAY_PERIOD_LOCKED:
         period_label = f"🔒 {period_label}"
     else:
@@ -174,107 +290,4 @@ for p in filtered_periods:
 
     period_options[p["id"]] = period_label
 
-# Default to current period if available
-default_index = 0
-if current_period and current_period.get("id") in period_options:
-    default_index = list(period_options.keys()).index(current_period.get("id"))
-
-selected_period_id = st.selectbox(
-    "Select pay period to view details:",
-    list(period_options.keys()),
-    index=default_index,
-    format_func=lambda x: period_options[x]
-)
-
-st.markdown("---")
-
-# Show selected period details
-if selected_period_id:
-    selected_period = next((p for p in pay_periods if p["id"] == selected_period_id), None)
-
-    if selected_period:
-        # Period info
-        col1, col2 = st.columns([2, 1])
-
-        with col1:
-            st.subheader("Period Information")
-            st.markdown(f"**Period:** {format_date(selected_period.get('start_date'))} to {format_date(selected_period.get('end_date'))}")
-            st.markdown(f"**Pay Date:** {format_date(selected_period.get('pay_date', 'N/A'))}")
-            st.markdown(f"**Status:** {selected_period.get('status', 'open').upper()}")
-
-            # Show if this is the current period
-            if current_period and selected_period.get("id") == current_period.get("id"):
-                st.success("⭐ This is the current pay period")
-
-        with col2:
-            st.subheader("Actions")
-            if selected_period.get("status") == PAY_PERIOD_OPEN:
-                if st.button("🔒 Lock Period", type="primary", use_container_width=True, key=f"lock_{selected_period_id}"):
-                    result = lock_pay_period(selected_period_id, use_service_role=True)
-                    if result:
-                        st.success("✅ Pay period locked successfully!")
-                        st.rerun()
-                    else:
-                        st.error("❌ Failed to lock period.")
-                st.caption("Lock this period to prevent changes to pay items")
-            else:
-                st.info("🔒 Period is locked")
-                st.caption("Locked periods cannot be modified")
-
-        st.markdown("---")
-
-        # Pay items for this period
-        st.subheader("💰 Pay Items")
-        pay_items = get_pay_items_by_period(selected_period_id, use_service_role=True)
-
-        if pay_items:
-            # Summary
-            total_hours = sum(float(item.get("hours", 0)) for item in pay_items)
-            total_amount = sum(float(item.get("amount", 0)) for item in pay_items)
-
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric("Total Hours", format_duration(total_hours))
-            with col2:
-                st.metric("Total Amount", format_currency(total_amount))
-            with col3:
-                st.metric("Employees", len(pay_items))
-
-            # Items table
-            items_data = []
-            for item in pay_items:
-                auditor = item.get("auditor") or {}
-                items_data.append({
-                    "Auditor": auditor.get("full_name", "Unknown"),
-                    "Hours": f"{float(item.get('hours', 0)):.2f}",
-                    "Rate": format_currency(item.get("rate")),
-                    "Amount": format_currency(item.get("amount"))
-                })
-
-            items_df = pd.DataFrame(items_data)
-            st.dataframe(items_df, use_container_width=True, hide_index=True)
-
-            # Download summary PDF
-            st.markdown("---")
-            col1, col2 = st.columns([1, 3])
-            with col1:
-                if st.button("📄 Generate Summary PDF", type="primary", use_container_width=True):
-                    with st.spinner("Generating PDF..."):
-                        pdf_buffer = generate_pay_period_summary_pdf(
-                            pay_period=selected_period,
-                            all_pay_items=pay_items
-                        )
-
-                        period_label = f"{format_date(selected_period.get('start_date'))}_{format_date(selected_period.get('end_date'))}"
-                        st.download_button(
-                            label="⬇️ Download PDF",
-                            data=pdf_buffer.getvalue(),
-                            file_name=f"pay_period_summary_{period_label}.pdf",
-                            mime="application/pdf",
-                            use_container_width=True
-                        )
-            with col2:
-                st.caption("Generate a PDF summary of all pay items for this period")
-        else:
-            st.info("📭 No pay items for this period yet.")
-            st.caption("Pay items will appear here once shifts are approved and processed.")
+period_details(period_options, default_index, periods_by_id, current_period)
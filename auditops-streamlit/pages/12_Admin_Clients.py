@@ -4,7 +4,8 @@ Admin Clients - Manage client profiles.
 import streamlit as st
 from src.pin_auth import require_authentication, require_role
 from src.config import ROLE_ADMIN
-from src.db import get_all_clients, create_client, update_client, delete_client, get_client_by_id
+from src.db import create_client, update_client, delete_client, get_client_by_id
+from src.cache import cached_clients, clear_client_caches
 from src.utils import format_date
 
 # Page config
@@ -37,6 +38,7 @@ with st.expander("➕ Create New Client", expanded=False):
                 }
                 result = create_client(data, use_service_role=True)
                 if result:
+                    clear_client_caches()
                     st.success(f"Client '{name}' created successfully!")
                     st.rerun()
                 else:
@@ -44,7 +46,7 @@ with st.expander("➕ Create New Client", expanded=False):
 
 # List clients
 st.subheader("All Clients")
-clients = get_all_clients(active_only=False)
+clients = cached_clients(active_only=False, fields="id,name,address,notes,is_active,created_at")
 
 if clients:
     # Filter options
@@ -57,7 +59,8 @@ if clients:
     # Filter clients
     filtered_clients = clients
     if search:
-        filtered_clients = [c for c in filtered_clients if search.lower() in c.get("name", "").lower()]
+        search_lc = search.lower()
+        filtered_clients = [c for c in filtered_clients if search_lc in c["_name_lc"]]
     if not show_inactive:
         filtered_clients = [c for c in filtered_clients if c.get("is_active", True)]
     
@@ -96,6 +99,7 @@ if clients:
                             }
                             result = update_client(client["id"], update_data, use_service_role=True)
                             if result:
+                                clear_client_caches()
                                 st.success("Client updated!")
                                 st.rerun()
                             else:
@@ -105,6 +109,7 @@ if clients:
                         if st.form_submit_button("🗑️ Delete", use_container_width=True):
                             result = delete_client(client["id"], use_service_role=True)
                             if result:
+                                clear_client_caches()
                                 st.success("Client deactivated.")
                                 st.rerun()
                             else:
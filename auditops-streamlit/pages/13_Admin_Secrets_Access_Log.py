@@ -4,8 +4,8 @@ Admin Secrets Access Log - View access logs for protected documents.
 import streamlit as st
 from src.pin_auth import require_authentication, require_role
 from src.config import ROLE_ADMIN
-from src.db import get_access_logs, get_all_clients
-from src.utils import format_datetime, get_user_display_name, get_client_display_name
+from src.db import get_access_logs
+from src.cache import client_name_map
 import pandas as pd
 
 # Page config
@@ -18,12 +18,32 @@ require_role(ROLE_ADMIN)
 st.title("🔒 Secrets Access Log")
 st.markdown("Monitor access to protected client documents and sensitive data.")
 
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _cached_access_logs(client_id: str | None, action: str | None, limit: int) -> list:
+    """Access logs for one set of filters, cached for 30 seconds."""
+    return get_access_logs(
+        client_id=client_id,
+        user_id=None,
+        limit=limit,
+        use_service_role=True,
+        action=action
+    )
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _csv_bytes(df: pd.DataFrame) -> bytes:
+    """
+    CSV export of the log table. Keyed on the DataFrame's contents (Streamlit
+    hashes DataFrames natively), so to_csv only runs once per distinct result.
+    """
+    return df.to_csv(index=False).encode()
+
+
 # Filters
 col1, col2, col3 = st.columns(3)
 with col1:
-    clients = get_all_clients(active_only=False)
-    client_options = {None: "All Clients"}
-    client_options.update({c["id"]: c["name"] for c in clients})
+    client_options = {None: "All Clients", **client_name_map()}
     selected_client_id = st.selectbox("Filter by Client", list(client_options.keys()), format_func=lambda x: client_options[x])
 
 with col2:
@@ -36,44 +56,42 @@ with col3:
 client_id_filter = selected_client_id if selected_client_id else None
 action_filter_value = action_filter.lower() if action_filter != "All" else None
 
-logs = get_access_logs(
-    client_id=client_id_filter,
-    user_id=None,
-    limit=limit,
-    use_service_role=True
-)
-
-# Filter by action if needed
-if action_filter_value:
-    logs = [log for log in logs if log.get("action") == action_filter_value]
+# Filtered in the query, so the limit applies to matching entries only
+logs = _cached_access_logs(client_id_filter, action_filter_value, int(limit))
 
 # Display logs
 if logs:
     st.metric("Total Log Entries", len(logs))
     
-    # Prepare table data
-    table_data = []
-    for log in logs:
-        table_data.append({
-            "Timestamp": format_datetime(log.get("created_at")),
-            "User": get_user_display_name(log.get("user")),
-            "Client": get_client_display_name(log.get("client")),
-            "Object Path": log.get("object_path", "—"),
-            "Action": log.get("action", "—").upper(),
-            "IP": log.get("ip_optional", "—")
-        })
-    
-    df = pd.DataFrame(table_data)
+    # Build the table with vectorized column ops on the flattened logs - the joined
+    # user and client become dotted columns ("user.full_name"). reindex adds any
+    # column the query didn't return as all-missing.
+    raw = pd.json_normalize(logs).reindex(columns=[
+        "created_at", "user.id", "user.full_name", "user.email",
+        "client.client_name", "client.name", "object_path", "action", "ip_optional",
+    ])
+    df = pd.DataFrame({
+        "Timestamp": pd.to_datetime(raw["created_at"], utc=True, errors="coerce", format="ISO8601")
+        .dt.strftime("%Y-%m-%d %H:%M").fillna("—"),
+        # Same fallbacks as get_user_display_name / get_client_display_name
+        "User": raw["user.full_name"].fillna(raw["user.email"]).fillna("—"),
+        "Client": raw["client.client_name"].fillna(raw["client.name"]).fillna("—"),
+        "Object Path": raw["object_path"].fillna("—"),
+        "Action": raw["action"].fillna("—").str.upper(),
+        "IP": raw["ip_optional"].fillna("—"),
+    })
     st.dataframe(df, use_container_width=True, hide_index=True)
     
     # Summary stats
     st.subheader("Summary Statistics")
     col1, col2, col3, col4 = st.columns(4)
     
-    view_count = sum(1 for log in logs if log.get("action") == "view")
-    download_count = sum(1 for log in logs if log.get("action") == "download")
-    upload_count = sum(1 for log in logs if log.get("action") == "upload")
-    unique_users = len(set(log.get("user", {}).get("id", "") for log in logs if log.get("user")))
+    # One counting pass over the action column instead of one pass per action
+    action_counts = raw["action"].value_counts()
+    view_count = int(action_counts.get("view", 0))
+    download_count = int(action_counts.get("download", 0))
+    upload_count = int(action_counts.get("upload", 0))
+    unique_users = raw["user.id"].nunique()
     
     with col1:
         st.metric("Views", view_count)
@@ -86,9 +104,9 @@ if logs:
     
     # Export option
     if st.button("📥 Export to CSV"):
-        from datetime import datetime
-        csv = df.to_csv(index=False)
-        timestamp = datetime.now().strftime('%Y%m%d')
+        import time
+        csv = _csv_bytes(df)
+        timestamp = time.strftime('%Y%m%d')
         st.download_button(
             label="Download CSV",
             data=csv,
@@ -3,37 +3,124 @@ Admin Client Approvals
 Review and approve/reject pending client registrations.
 """
 import streamlit as st
-from src.pin_auth import require_authentication, require_role, get_current_user
+from src.pin_auth import require_role
 from src.config import ROLE_ADMIN
 from src.supabase_client import get_client
+from src.utils import run_in_background
 from datetime import datetime, timezone
+from functools import partial
 
 # Page config
 st.set_page_config(page_title="Client Approvals", layout="wide")
 
 # Authentication
-require_authentication()
-require_role(ROLE_ADMIN)
-
-user = get_current_user()
+user = require_role(ROLE_ADMIN)
 admin_id = user.get('id')
 
 st.title("🏢 Client Registration Approvals")
 st.markdown("Review and approve pending client registrations.")
 st.markdown("---")
 
-# Get pending clients
+# Decisions whose database write is still running (or finished since the last run),
+# keyed by client_id
+if "client_approvals_inflight" not in st.session_state:
+    st.session_state.client_approvals_inflight = {}
+inflight = st.session_state.client_approvals_inflight
+
 client = get_client(service_role=True)
-response = client.table("clients").select("*").eq("approval_status", "pending").order("created_at").execute()
-pending_clients = response.data or []
 
-if not pending_clients:
+
+def _approve_client_record(client_id: str, update_data: dict):
+    """Apply the admin's edits and approve a pending client."""
+    return client.table("clients").update(update_data).eq("client_id", client_id).execute()
+
+
+def _reject_client_record(client_id: str):
+    """Delete a pending client registration."""
+    return client.table("clients").delete().eq("client_id", client_id).execute()
+
+
+# Report decisions whose write has finished since the last run
+for client_id, decision in list(inflight.items()):
+    future = decision["future"]
+    if not future.done():
+        continue
+    del inflight[client_id]
+    if future.exception() is None and future.result().data:
+        if decision["action"] == "approve":
+            st.success(f"✅ Approved: {decision['name']}")
+            st.balloons()
+        else:
+            st.warning(f"❌ Rejected: {decision['name']}")
+    else:
+        st.error(f"Failed to {decision['action']} {decision['name']}. Please try again.")
+
+
+
+@st.fragment(run_every=1)
+def watch_inflight_decisions():
+    """
+    Show the saving status and poll the in-flight writes once a second.
+
+    As soon as one finishes, rerun the whole page so its outcome is reported
+    above without waiting for the admin's next click.
+    """
+    if any(decision["future"].done() for decision in inflight.values()):
+        st.rerun(scope="app")
+    st.caption(f"⏳ Saving {len(inflight)} decision(s)...")
+
+
+if inflight:
+    watch_inflight_decisions()
+
+# Pending clients per page
+PAGE_SIZE = 20
+
+# Only the columns the review cards use
+PENDING_CLIENT_COLUMNS = (
+    "client_id,client_name,address,contact_person,contact_email,contact_phone,"
+    "wifi_name,wifi_password,special_instructions,created_at"
+)
+
+# Get one page of pending clients. The page widget is rendered further down,
+# but its value from the last run is already in session state.
+page = st.session_state.get("client_approvals_page", 1)
+offset = (page - 1) * PAGE_SIZE
+
+response = (
+    client.table("clients")
+    .select(PENDING_CLIENT_COLUMNS, count="exact")
+    .eq("approval_status", "pending")
+    .order("created_at")
+    .range(offset, offset + PAGE_SIZE - 1)
+    .execute()
+)
+# Hide clients whose decision is still being saved, and leave them out of the count
+page_rows = response.data or []
+pending_clients = [c for c in page_rows if c["client_id"] not in inflight]
+saving_on_page = len(page_rows) - len(pending_clients)
+pending_total = (response.count if response.count is not None else len(page_rows)) - saving_on_page
+total_pages = max(1, -(-pending_total // PAGE_SIZE))
+
+if page > total_pages:
+    # Approvals emptied the page we were on - step back to the last page
+    st.session_state.client_approvals_page = total_pages
+    st.rerun()
+
+if pending_total <= 0:
     st.success("✅ No pending client approvals!")
     st.info("New client registrations will appear here for review.")
 else:
-    st.metric("Pending Approvals", len(pending_clients))
+    st.metric("Pending Approvals", pending_total)
 
-    for idx, client_record in enumerate(pending_clients):
+    if total_pages > 1:
+        st.number_input("Page", min_value=1, max_value=total_pages, step=1, key="client_approvals_page")
+        st.caption(f"Page {page} of {total_pages}")
+
+    if not pending_clients:
+        st.info("Every client on this page is being saved. Other pages still have pending clients.")
+
+    for client_record in pending_clients:
         with st.expander(f"📋 {client_record['client_name']}", expanded=True):
             col1, col2 = st.columns([2, 1])
 
@@ -63,7 +150,7 @@ else:
             with col2:
                 st.markdown("### Review & Edit")
 
-                with st.form(f"edit_client_{idx}"):
+                with st.form(f"edit_client_{client_record['client_id']}"):
                     # Editable fields
                     edited_name = st.text_input("Company Name", value=client_record['client_name'])
                     edited_address = st.text_area("Address", value=client_record.get('address', ''))
@@ -92,34 +179,44 @@ else:
                             "approved_at": datetime.now(timezone.utc).isoformat()
                         }
 
-                        client_db = get_client(service_role=True)
-                        result = client_db.table("clients").update(update_data).eq("client_id", client_record['client_id']).execute()
-
-                        if result.data:
-                            st.success(f"✅ Approved: {edited_name}")
-                            st.balloons()
-                            st.rerun()
-                        else:
-                            st.error("Failed to approve. Please try again.")
+                        # Save in the background and drop the card right away; the
+                        # outcome is reported at the top of a later run
+                        inflight[client_record['client_id']] = {
+                            "future": run_in_background(partial(_approve_client_record, client_record['client_id'], update_data)),
+                            "action": "approve",
+                            "name": edited_name,
+                        }
+                        st.rerun()
 
                     if reject:
-                        # Delete the pending registration
-                        client_db = get_client(service_role=True)
-                        result = client_db.table("clients").delete().eq("client_id", client_record['client_id']).execute()
-
-                        if result.data:
-                            st.warning(f"❌ Rejected: {client_record['client_name']}")
-                            st.rerun()
-                        else:
-                            st.error("Failed to reject. Please try again.")
+                        # Delete the pending registration in the background
+                        inflight[client_record['client_id']] = {
+                            "future": run_in_background(partial(_reject_client_record, client_record['client_id'])),
+                            "action": "reject",
+                            "name": client_record['client_name'],
+                        }
+                        st.rerun()
 
 st.markdown("---")
 
 # Show recently approved
-with st.expander("📊 Recently Approved Clients"):
-    approved = client.table("clients").select("*").eq("approval_status", "approved").order("approved_at", desc=True).limit(10).execute()
+@st.fragment
+def show_recently_approved_clients():
+    """
+    Show the last 10 approved clients.
+
+    The query only runs once the admin switches the toggle on, and as a fragment
+    the toggle doesn't rerun the pending-approval list above.
+    """
+    if not st.toggle("📊 Show Recently Approved Clients", key="show_recently_approved_clients"):
+        return
+
+    approved = client.table("clients").select("client_name, approved_at").eq("approval_status", "approved").order("approved_at", desc=True).limit(10).execute()
     if approved.data:
         for c in approved.data:
             st.write(f"✅ **{c['client_name']}** - Approved {c.get('approved_at', 'N/A')}")
     else:
         st.info("No approved clients yet.")
+
+
+show_recently_approved_clients()
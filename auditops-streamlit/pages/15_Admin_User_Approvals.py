@@ -3,7 +3,7 @@ Admin User Approvals
 Review and approve/reject pending user registrations.
 """
 import streamlit as st
-from src.pin_auth import require_authentication, require_role, get_current_user
+from src.pin_auth import require_role
 from src.config import ROLE_ADMIN
 from src.supabase_client import get_client
 from datetime import datetime, timezone
@@ -12,10 +12,7 @@ from datetime import datetime, timezone
 st.set_page_config(page_title="User Approvals", layout="wide")
 
 # Authentication
-require_authentication()
-require_role(ROLE_ADMIN)
-
-user = get_current_user()
+user = require_role(ROLE_ADMIN)
 admin_id = user.get('id')
 
 st.title("👤 User Registration Approvals")
@@ -91,8 +88,7 @@ else:
                             "approved_at": datetime.now(timezone.utc).isoformat()
                         }
 
-                        client_db = get_client(service_role=True)
-                        result = client_db.table("app_users").update(update_data).eq("id", user_record['id']).execute()
+                        result = client.table("app_users").update(update_data).eq("id", user_record['id']).execute()
 
                         if result.data:
                             st.success(f"✅ Approved: {edited_name}")
@@ -104,8 +100,7 @@ else:
 
                     if reject:
                         # Delete the pending registration
-                        client_db = get_client(service_role=True)
-                        result = client_db.table("app_users").delete().eq("id", user_record['id']).execute()
+                        result = client.table("app_users").delete().eq("id", user_record['id']).execute()
 
                         if result.data:
                             st.warning(f"❌ Rejected: {user_record['name']}")
@@ -116,10 +111,23 @@ else:
 st.markdown("---")
 
 # Show recently approved
-with st.expander("📊 Recently Approved Users"):
+@st.fragment
+def show_recently_approved_users():
+    """
+    Show the last 10 approved users.
+
+    The query only runs once the admin switches the toggle on, and as a fragment
+    the toggle doesn't rerun the pending-approval list above.
+    """
+    if not st.toggle("📊 Show Recently Approved Users", key="show_recently_approved_users"):
+        return
+
     approved = client.table("app_users").select("id, name, email, role, approved_at").eq("approval_status", "approved").order("approved_at", desc=True).limit(10).execute()
     if approved.data:
         for u in approved.data:
             st.write(f"✅ **{u['name']}** ({u['role']}) - Approved {u.get('approved_at', 'N/A')}")
     else:
         st.info("No approved users yet.")
+
+
+show_recently_approved_users()
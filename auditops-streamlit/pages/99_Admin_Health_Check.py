@@ -1,12 +1,15 @@
 """
 Admin Health Check - System health and connectivity checks.
 """
+import hashlib
+import time
+from functools import partial
 import streamlit as st
-from datetime import datetime
 from src.pin_auth import require_authentication, require_role
 from src.config import ROLE_ADMIN, validate_config, get_supabase_url, get_supabase_key
 from src.supabase_client import get_client, reset_clients
 from src.db import get_all_clients, get_all_profiles
+from src.utils import run_in_parallel
 
 # Page config
 st.set_page_config(page_title="Health Check", layout="wide")
@@ -48,37 +51,69 @@ service_key = get_supabase_key(service_role=True)
 results["anon_key"] = check_status("Anon Key", bool(anon_key), "Present" if anon_key else "Missing")
 results["service_key"] = check_status("Service Role Key", bool(service_key), "Present" if service_key else "Missing")
 
+# Connectivity probes
+TABLES = ["profiles", "clients", "shifts", "pay_periods", "pay_items", "approvals", "access_logs"]
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def run_connectivity_checks(url: str, key_hash: str) -> tuple[dict, str]:
+    """
+    Probe database and table access. Cached for 30 seconds so reruns skip the round-trips.
+
+    The probes run concurrently, so the wall time is the slowest probe rather than the sum.
+
+    Args:
+        url: Supabase URL (part of the cache key)
+        key_hash: Hash of the configured keys, so rotated keys re-run the probes
+                  without the keys themselves ending up in the cache key
+
+    Returns:
+        tuple: (check name -> (passed, message), time the probes ran)
+    """
+    # Check name -> (use service role, table, success message)
+    probes = {
+        "db_anon": (False, "profiles", "Connected successfully"),
+        "db_service": (True, "profiles", "Connected successfully"),
+    }
+    probes.update({f"table_{table}": (True, table, "Accessible") for table in TABLES})
+
+    # Resolve each client once up front - the anon client is shared and get_client
+    # rehydrates its session on every call, so the probes shouldn't race on that
+    clients = {}
+    for service_role in (False, True):
+        try:
+            clients[service_role] = get_client(service_role=service_role)
+        except Exception as e:
+            clients[service_role] = e
+
+    def probe(service_role: bool, table: str, success_message: str) -> tuple[bool, str]:
+        client = clients[service_role]
+        if isinstance(client, Exception):
+            return False, str(client)
+        try:
+            client.table(table).select("id").limit(1).execute()
+            return True, success_message
+        except Exception as e:
+            return False, str(e)
+
+    outcomes = run_in_parallel(*(partial(probe, *args) for args in probes.values()))
+
+    checked_at = time.strftime('%Y-%m-%d %H:%M:%S')
+    return dict(zip(probes, outcomes)), checked_at
+
+
+key_hash = hashlib.sha256(f"{anon_key}:{service_key}".encode()).hexdigest()
+checks, checked_at = run_connectivity_checks(url, key_hash)
+
 # Database connectivity
 st.subheader("Database Connectivity")
-try:
-    client = get_client(service_role=False)
-    # Test query
-    test_result = client.table("profiles").select("id").limit(1).execute()
-    results["db_anon"] = check_status("Database (Anon Key)", True, "Connected successfully")
-except Exception as e:
-    results["db_anon"] = check_status("Database (Anon Key)", False, str(e))
-
-try:
-    client_service = get_client(service_role=True)
-    # Test query
-    test_result = client_service.table("profiles").select("id").limit(1).execute()
-    results["db_service"] = check_status("Database (Service Key)", True, "Connected successfully")
-except Exception as e:
-    results["db_service"] = check_status("Database (Service Key)", False, str(e))
+results["db_anon"] = check_status("Database (Anon Key)", *checks["db_anon"])
+results["db_service"] = check_status("Database (Service Key)", *checks["db_service"])
 
 # Table checks
 st.subheader("Table Access")
-tables = ["profiles", "clients", "shifts", "pay_periods", "pay_items", "approvals", "access_logs"]
-
-for table in tables:
-    try:
-        client = get_client(service_role=True)
-        result = client.table(table).select("id").limit(1).execute()
-        check_status(f"Table: {table}", True, "Accessible")
-        results[f"table_{table}"] = True
-    except Exception as e:
-        check_status(f"Table: {table}", False, str(e))
-        results[f"table_{table}"] = False
+for table in TABLES:
+    results[f"table_{table}"] = check_status(f"Table: {table}", *checks[f"table_{table}"])
 
 # Data counts
 st.subheader("Data Counts")
@@ -126,8 +161,9 @@ else:
 # Refresh button
 if st.button("🔄 Refresh Health Check", type="primary"):
     reset_clients()
+    run_connectivity_checks.clear()
     st.rerun()
 
-# Timestamp
-st.caption(f"Last checked: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+# Timestamp - when the (cached) probes actually ran, not when this page rendered
+st.caption(f"Last checked: {checked_at}")
 
@@ -263,6 +263,22 @@ def login(email: str, password: str) -> dict:
         }
 
 
+# Built once at import rather than on every logout() call
+_CLEAR_TOKENS_SCRIPT = """
+    <script>
+    (function() {
+        try {
+            localStorage.removeItem("auditops_at");
+            localStorage.removeItem("auditops_rt");
+            console.log("[AuditOps] Cleared tokens from localStorage on logout");
+        } catch(e) {
+            console.error("[AuditOps] Failed to clear tokens:", e);
+        }
+    })();
+    </script>
+"""
+
+
 def logout():
     """Log out current user and clear session."""
     import streamlit.components.v1 as components
@@ -274,24 +290,16 @@ def logout():
         pass
 
     # Clear localStorage tokens using components.html() - st.markdown() doesn't execute scripts!
-    components.html("""
-        <script>
-        (function() {
-            try {
-                localStorage.removeItem("auditops_at");
-                localStorage.removeItem("auditops_rt");
-                console.log("[AuditOps] Cleared tokens from localStorage on logout");
-            } catch(e) {
-                console.error("[AuditOps] Failed to clear tokens:", e);
-            }
-        })();
-        </script>
-    """, height=0)
+    # Only a live session can have persisted tokens, so skip the iframe otherwise.
+    if st.session_state.get("supabase_session") or st.session_state.get("auth_session"):
+        components.html(_CLEAR_TOKENS_SCRIPT, height=0)
 
     # Clear session state
-    for key in ["auth_user", "auth_session", "user_profile", "supabase_session", "restore_attempted", "restore_succeeded"]:
-        if key in st.session_state:
-            del st.session_state[key]
+    for key in ["auth_user", "auth_session", "user_profile", "supabase_session", "_jwt_payload", "_validated_token_id", "restore_attempted", "restore_succeeded"]:
+        st.session_state.pop(key, None)
+
+    # Drop cached profiles so the next login re-reads role changes
+    _load_user_profile_cached.clear()
 
 
 def get_current_user():
@@ -309,14 +317,47 @@ def is_authenticated() -> bool:
     return "auth_user" in st.session_state and st.session_state.auth_user is not None
 
 
+class _ProfileNotFound(Exception):
+    """Raised inside the cached profile lookup so that misses are never cached."""
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _load_user_profile_cached(user_id: str, _client=None) -> dict:
+    """Cached profile lookup keyed by user_id (the client is excluded from the key)."""
+    profile = _query_user_profile(user_id, client=_client)
+    if profile is None:
+        raise _ProfileNotFound(user_id)
+    return profile
+
+
 def load_user_profile(user_id: str, client=None) -> dict | None:
+    """
+    Load user profile, cached per user_id for 5 minutes.
+
+    Only successful lookups are cached, so a profile created after a failed
+    login is picked up on the next attempt. The cache is cleared on logout.
+
+    Args:
+        user_id: Supabase Auth user ID (UUID)
+        client: Optional Supabase client instance (if provided, uses this instead of creating new)
+
+    Returns:
+        dict: Profile data or None if not found
+    """
+    try:
+        return _load_user_profile_cached(user_id, _client=client)
+    except _ProfileNotFound:
+        return None
+
+
+def _query_user_profile(user_id: str, client=None) -> dict | None:
     """
     Load user profile from database.
-    
+
     Args:
         user_id: Supabase Auth user ID (UUID)
         client: Optional Supabase client instance (if provided, uses this instead of creating new)
-    
+
     Returns:
         dict: Profile data or None if not found
     """
@@ -460,25 +501,31 @@ def is_auditor() -> bool:
     return get_user_role() == ROLE_AUDITOR
 
 
-def establish_recovery_session(query_params: dict) -> tuple[bool, str | None]:
+def establish_recovery_session(query_params) -> tuple[bool, str | None]:
     """
     Establish recovery session from query parameters.
     Handles both code-based (?code=...) and token-based (#access_token=...) flows.
     
     Args:
-        query_params: Dictionary of query parameters from st.query_params
+        query_params: Mapping of query parameters - pass st.query_params directly, no dict() copy needed
     
     Returns:
         tuple: (success: bool, error_message: str | None)
     """
     import logging
     
+    code = query_params.get("code")
+    access_token = query_params.get("access_token")
+    refresh_token = query_params.get("refresh_token")
+    
+    if not code and not (access_token and refresh_token):
+        return False, "No recovery code or tokens found in query parameters"
+    
     try:
         client = get_client(service_role=False)
         
         # Try code-based flow first
-        if "code" in query_params and query_params["code"]:
-            code = query_params["code"]
+        if code:
             logging.info("Attempting code-based recovery session (exchange_code_for_session)")
             try:
                 # Try dict-style first
@@ -519,10 +566,7 @@ def establish_recovery_session(query_params: dict) -> tuple[bool, str | None]:
                 return False, error_msg[:200]
         
         # Try token-based flow
-        elif ("access_token" in query_params and query_params["access_token"]) and \
-             ("refresh_token" in query_params and query_params["refresh_token"]):
-            access_token = query_params["access_token"]
-            refresh_token = query_params["refresh_token"]
+        else:
             logging.info("Attempting token-based recovery session (set_session)")
             
             try:
@@ -559,9 +603,6 @@ def establish_recovery_session(query_params: dict) -> tuple[bool, str | None]:
                 error_msg = str(e)
                 logging.error(f"Token-based recovery session failed: {error_msg[:200]}")
                 return False, error_msg[:200]
-        
-        else:
-            return False, "No recovery code or tokens found in query parameters"
             
     except Exception as e:
         error_msg = str(e)
@@ -0,0 +1,32 @@
+"""
+Cached reads shared by more than one page.
+"""
+from typing import Dict, List, Optional
+import streamlit as st
+from src.db import get_all_clients
+
+
+@st.cache_data(ttl=120, show_spinner=False)
+def cached_clients(active_only: bool = False, fields: Optional[str] = None) -> List[Dict]:
+    """
+    Clients from get_all_clients(), cached for 2 minutes per active_only/fields.
+
+    Each client also gets a lowercase "_name_lc" for name searches, built once
+    here instead of lowercasing every name on every keystroke.
+    """
+    clients = get_all_clients(active_only=active_only, fields=fields)
+    for c in clients:
+        c["_name_lc"] = (c.get("name") or "").lower()
+    return clients
+
+
+@st.cache_data(ttl=120, show_spinner=False)
+def client_name_map() -> Dict[str, str]:
+    """Client id -> name for every client (active or not), cached for 2 minutes."""
+    return {c["id"]: c["name"] for c in cached_clients(False, fields="id,name")}
+
+
+def clear_client_caches():
+    """Drop the cached client reads. Call after creating, updating or deleting a client."""
+    cached_clients.clear()
+    client_name_map.clear()
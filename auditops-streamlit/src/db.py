@@ -218,10 +218,67 @@ def get_client_by_id(client_id: str) -> Optional[Dict]:
     return None
 
 
-def get_all_clients(active_only: bool = True) -> List[Dict]:
+def _client_profile_row(row: Dict) -> Dict:
+    """Map a clients table row to the full client profile format."""
+    return {
+        "id": row["client_id"],
+        "name": row["client_name"],
+        "is_active": row["active"],
+        "address": row.get("address"),
+        "notes": row.get("notes"),
+        "contact_person": row.get("contact_person"),
+        "contact_email": row.get("contact_email"),
+        "contact_phone": row.get("contact_phone"),
+        "wifi_name": row.get("wifi_name"),
+        "wifi_password": row.get("wifi_password"),
+        "alarm_code": row.get("alarm_code"),
+        "lockbox_code": row.get("lockbox_code"),
+        "code_for_lights": row.get("code_for_lights"),
+        "cage_lock_code": row.get("cage_lock_code"),
+        "patio_code": row.get("patio_code"),
+        "audit_day": row.get("audit_day"),
+        "special_instructions": row.get("special_instructions"),
+        "created_at": row.get("created_at")
+    }
+
+
+# Profile field names that are named differently in the clients table
+_CLIENT_PROFILE_COLUMNS = {"id": "client_id", "name": "client_name", "is_active": "active"}
+
+# Cached column names of the live clients table
+_clients_columns = None
+
+def _get_clients_columns() -> Optional[set]:
+    """
+    Column names of the live clients table, read once from a sample row.
+
+    sql/schema.sql doesn't match the live table, so this is the only reliable
+    way to know which columns can be selected. Returns None (and retries next
+    time) if the table is empty or the probe fails.
+    """
+    global _clients_columns
+    if _clients_columns is not None:
+        return _clients_columns
+    client = get_client(service_role=True)
+    try:
+        response = client.table("clients").select("*").limit(1).execute()
+    except Exception:
+        return None
+    if response.data:
+        _clients_columns = set(response.data[0])
+    return _clients_columns
+
+
+def get_all_clients(active_only: bool = True, fields: Optional[str] = None) -> List[Dict]:
     """
     Get all clients from database with full details.
 
+    Pass fields (comma-separated profile field names, e.g. "id,name,address") to
+    only fetch those columns. id, name and is_active are always fetched; fields
+    the live table doesn't have are skipped, and profile fields that weren't
+    fetched are None. If the table's columns can't be determined, all columns
+    are fetched.
+
     Database schema:
     - client_id (uuid)
     - client_name (text)
@@ -233,8 +290,19 @@ def get_all_clients(active_only: bool = True) -> List[Dict]:
     """
     client = get_client(service_role=True)
 
-    # Query all client columns
-    query = client.table("clients").select("*")
+    existing_columns = _get_clients_columns() if fields else None
+    if existing_columns is not None:
+        # Query only the requested columns that exist, plus the ones every profile
+        # needs - selecting a missing column would fail the whole query
+        columns = ["client_id", "client_name", "active"]
+        for field in fields.split(","):
+            column = _CLIENT_PROFILE_COLUMNS.get(field.strip(), field.strip())
+            if column in existing_columns and column not in columns:
+                columns.append(column)
+        query = client.table("clients").select(",".join(columns))
+    else:
+        # Query all client columns
+        query = client.table("clients").select("*")
 
     if active_only:
         query = query.eq("active", True)
@@ -242,29 +310,48 @@ def get_all_clients(active_only: bool = True) -> List[Dict]:
     response = query.order("client_name").execute()
 
     # Map to expected format with all fields
-    result = []
-    for row in (response.data or []):
-        result.append({
-            "id": row["client_id"],
-            "name": row["client_name"],
-            "is_active": row["active"],
-            "address": row.get("address"),
-            "notes": row.get("notes"),
-            "contact_person": row.get("contact_person"),
-            "contact_email": row.get("contact_email"),
-            "contact_phone": row.get("contact_phone"),
-            "wifi_name": row.get("wifi_name"),
-            "wifi_password": row.get("wifi_password"),
-            "alarm_code": row.get("alarm_code"),
-            "lockbox_code": row.get("lockbox_code"),
-            "code_for_lights": row.get("code_for_lights"),
-            "cage_lock_code": row.get("cage_lock_code"),
-            "patio_code": row.get("patio_code"),
-            "audit_day": row.get("audit_day"),
-            "special_instructions": row.get("special_instructions")
-        })
-
-    return result
+    return [_client_profile_row(row) for row in (response.data or [])]
+
+
+def search_clients(query: str, limit: int = 50, offset: int = 0, active_only: bool = True) -> List[Dict]:
+    """
+    Search clients by name, address or contact person in the database.
+
+    Matching is a case-insensitive substring match (ILIKE), so only the matching
+    page of rows is transferred instead of the whole client list.
+
+    Args:
+        query: Search text
+        limit: Maximum number of clients to return
+        offset: Number of matching clients to skip (for paging)
+        active_only: Only return active clients
+
+    Returns:
+        List of client profiles in the same format as get_all_clients()
+    """
+    # Characters that are part of PostgREST's or=(...) filter syntax (and the *
+    # wildcard) can't be passed through, so they are dropped. Backslash and the
+    # ILIKE wildcards % and _ are escaped so they match literally.
+    term = "".join(ch for ch in query if ch not in ',()*"').strip()
+    term = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+    client = get_client(service_role=True)
+
+    query_builder = client.table("clients").select("*")
+
+    # An empty search lists every client, one page at a time
+    if term:
+        pattern = f"*{term}*"
+        query_builder = query_builder.or_(
+            f"client_name.ilike.{pattern},address.ilike.{pattern},contact_person.ilike.{pattern}"
+        )
+
+    if active_only:
+        query_builder = query_builder.eq("active", True)
+
+    response = query_builder.order("client_name").range(offset, offset + limit - 1).execute()
+
+    return [_client_profile_row(row) for row in (response.data or [])]
 
 
 def create_client(data: Dict, use_service_role: bool = True) -> Optional[Dict]:
@@ -303,8 +390,15 @@ def get_shift(shift_id: str) -> Optional[Dict]:
     return None
 
 
-def get_shifts_by_auditor(auditor_id: str, status: Optional[str] = None) -> List[Dict]:
-    """Get shifts for an auditor."""
+def get_shifts_by_auditor(auditor_id: str, status: Optional[str] = None, since: Optional[str] = None) -> List[Dict]:
+    """
+    Get shifts for an auditor, newest first.
+
+    Args:
+        auditor_id: Auditor's user ID
+        status: Optional shift status filter
+        since: Optional ISO timestamp - only shifts checked in at or after it
+    """
     import logging
     client = get_client(service_role=False)
 
@@ -312,6 +406,8 @@ def get_shifts_by_auditor(auditor_id: str, status: Optional[str] = None) -> List
         query = client.table("shifts").select("*, client:clients(*)").eq("auditor_id", auditor_id)
         if status:
             query = query.eq("status", status)
+        if since:
+            query = query.gte("check_in", since)
         response = query.order("check_in", desc=True).execute()
         return response.data or []
     except Exception as e:
@@ -324,6 +420,8 @@ def get_shifts_by_auditor(auditor_id: str, status: Optional[str] = None) -> List
             query = client.table("shifts").select("*").eq("auditor_id", auditor_id)
             if status:
                 query = query.eq("status", status)
+            if since:
+                query = query.gte("check_in", since)
             response = query.order("check_in", desc=True).execute()
 
             # If this works, the issue is with the clients table join
@@ -747,6 +845,47 @@ def get_approvals_by_shift(shift_id: str, limit: int = 100) -> List[Dict]:
         return []
 
 
+@log_postgrest_errors
+@track_api_errors
+def get_approvals_by_shifts(shift_ids: List[str]) -> Dict[str, List[Dict]]:
+    """
+    Get approvals for several shifts at once, grouped by shift_id.
+
+    Batched version of get_approvals_by_shift: one approvals query and one
+    app_users query for all approvers, instead of one of each per shift.
+
+    Args:
+        shift_ids: The shift IDs to get approvals for
+
+    Returns:
+        Dict of shift_id -> approval dicts (newest first) with nested 'approver'
+        data. Shifts without approvals are absent. Raises on query failure.
+    """
+    if not shift_ids:
+        return {}
+
+    client = get_client(service_role=True)
+    response = client.table("approvals").select("*").in_("shift_id", list(shift_ids)).order("created_at", desc=True).execute()
+    approvals = response.data or []
+    logging.info(f"[DB] Got {len(approvals)} approvals for {len(shift_ids)} shifts")
+
+    # Fetch every approver in one query (app_users by auth_uuid, not profiles)
+    approver_ids = list({a['approver_id'] for a in approvals if a.get('approver_id')})
+    approvers = {}
+    if approver_ids:
+        try:
+            approver_response = client.table("app_users").select("auth_uuid, id, name, email, phone, role").in_("auth_uuid", approver_ids).execute()
+            approvers = {row.pop('auth_uuid'): row for row in (approver_response.data or [])}
+        except Exception as approver_err:
+            logging.warning(f"[DB] Could not fetch approvers: {approver_err}")
+
+    by_shift = {}
+    for approval in approvals:
+        approval['approver'] = approvers.get(approval.get('approver_id'))
+        by_shift.setdefault(approval['shift_id'], []).append(approval)
+    return by_shift
+
+
 def create_approval(shift_id: str, approver_id: str, decision: str, notes: Optional[str] = None, use_service_role: bool = True) -> Optional[Dict]:
     """Create an approval decision."""
     client = get_client(service_role=use_service_role)
@@ -921,15 +1060,25 @@ def create_access_log(user_id: str, client_id: Optional[str], object_path: str,
     return None
 
 
-def get_access_logs(client_id: Optional[str] = None, user_id: Optional[str] = None, limit: int = 100, use_service_role: bool = True) -> List[Dict]:
-    """Get access logs with optional filters."""
+def get_access_logs(client_id: Optional[str] = None, user_id: Optional[str] = None, limit: int = 100, use_service_role: bool = True, action: Optional[str] = None) -> List[Dict]:
+    """
+    Get access logs with optional filters.
+
+    Only the columns the access log page shows are selected. The joined client is
+    still fetched whole because its name column differs between schema versions
+    (name vs client_name).
+    """
     client = get_client(service_role=use_service_role)
-    query = client.table("access_logs").select("*, user:profiles(*), client:clients(*)")
+    query = client.table("access_logs").select(
+        "created_at, object_path, action, ip_optional, user:profiles(id, full_name, email), client:clients(*)"
+    )
     
     if client_id:
         query = query.eq("client_id", client_id)
     if user_id:
         query = query.eq("user_id", user_id)
+    if action:
+        query = query.eq("action", action)
     
     response = query.order("created_at", desc=True).limit(limit).execute()
     return response.data or []
@@ -0,0 +1,60 @@
+"""
+Shift helpers for the Field Mode page.
+"""
+from datetime import date, datetime
+from typing import Dict, List, Optional
+from src.config import SHIFT_STATUS_DRAFT, SHIFT_STATUS_SUBMITTED
+from src.utils import _parse_iso_datetime
+
+
+def safe_parse_iso(value: Optional[str]) -> Optional[datetime]:
+    """Safely parse ISO datetime string."""
+    if not value:
+        return None
+    try:
+        return _parse_iso_datetime(value)
+    except Exception:
+        return None
+
+
+def find_today_shifts(all_shifts: List[Dict], today_utc: date) -> tuple[Optional[Dict], Optional[Dict]]:
+    """
+    Find today's open shift and today's draft shift that is ready to submit.
+
+    Shifts are expected newest first, so the first match of each kind is the latest.
+    Check-ins are stored in UTC, so a cheap date-prefix compare skips older shifts
+    before any datetime parsing.
+
+    Args:
+        all_shifts: The auditor's shifts, ordered by check_in descending
+        today_utc: Current UTC date
+
+    Returns:
+        tuple: (open_shift, submit_ready_shift), either may be None
+    """
+    open_shift = None
+    submit_ready_shift = None
+    today_prefix = today_utc.isoformat()
+
+    for shift in all_shifts:
+        check_in_str = shift.get("check_in")
+        if not check_in_str or not check_in_str.startswith(today_prefix):
+            continue
+        check_in_dt = safe_parse_iso(check_in_str)
+        check_in_date = check_in_dt.date() if check_in_dt else None
+
+        if check_in_date == today_utc:
+            status = shift.get("status")
+            check_out = shift.get("check_out")
+
+            if status in [SHIFT_STATUS_DRAFT, SHIFT_STATUS_SUBMITTED] and not check_out:
+                if open_shift is None:
+                    open_shift = shift
+            elif status == SHIFT_STATUS_DRAFT and check_out:
+                if submit_ready_shift is None:
+                    submit_ready_shift = shift
+
+        if open_shift and submit_ready_shift:
+            break
+
+    return open_shift, submit_ready_shift
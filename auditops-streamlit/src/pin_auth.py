@@ -25,10 +25,13 @@ def get_user_role() -> str:
     return ''
 
 
-def require_authentication():
+def require_authentication() -> dict | None:
     """
     Require user to be authenticated.
     If not authenticated, show login message and stop page execution.
+
+    Returns:
+        dict: The logged-in user's data, so callers don't need to look it up again
     """
     if not is_authenticated():
         st.error("🔒 Please log in to access this page.")
@@ -36,9 +39,10 @@ def require_authentication():
         if st.button("Go to Login Page"):
             st.switch_page("app.py")
         st.stop()
+    return st.session_state.get('user', None)
 
 
-def require_role(allowed_roles: list[str] | str):
+def require_role(allowed_roles: list[str] | str) -> dict | None:
     """
     Require user to have one of the allowed roles.
     ADMIN role has access to all pages regardless of requirement.
@@ -46,26 +50,29 @@ def require_role(allowed_roles: list[str] | str):
     Args:
         allowed_roles: Single role string or list of allowed role strings
 
+    Returns:
+        dict: The logged-in user's data, so pages don't need get_current_user()
+
     Example:
         require_role(ROLE_ADMIN)  # Only admins
         require_role([ROLE_ADMIN, ROLE_MANAGER])  # Admins or managers
         require_role(ROLE_AUDITOR)  # Auditors, managers, and admins
     """
-    # First ensure user is authenticated
-    require_authentication()
+    # First ensure user is authenticated, reusing the user it resolved
+    user = require_authentication()
 
     # Normalize to list
     if isinstance(allowed_roles, str):
         allowed_roles = [allowed_roles]
 
-    user_role = get_user_role()
+    user_role = user.get('role', 'AUDITOR') if user else ''
 
     # Strip whitespace and normalize role for comparison
     user_role_normalized = user_role.strip().upper() if user_role else ""
 
     # ADMIN has access to ALL pages - check multiple ways to be safe
     if user_role_normalized == "ADMIN" or user_role == ROLE_ADMIN:
-        return
+        return user
 
     # Also normalize allowed roles for comparison
     allowed_roles_normalized = [r.strip().upper() if isinstance(r, str) else r for r in allowed_roles]
@@ -78,6 +85,8 @@ def require_role(allowed_roles: list[str] | str):
             st.switch_page("app.py")
         st.stop()
 
+    return user
+
 
 def should_show_page(page_name: str, user_role: str = None) -> bool:
     """
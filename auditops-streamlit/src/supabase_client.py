@@ -1,13 +1,102 @@
 """
 Supabase client initialization.
 """
+import base64
+import hashlib
+import json
+import time
 import streamlit as st
 from supabase import create_client, Client
 from src.config import get_supabase_url, get_supabase_key, validate_config
 
-# Global client instance
-_supabase_client: Client | None = None
-_supabase_service_client: Client | None = None
+# Access token last applied to the shared anon client via set_session()
+_client_access_token: str | None = None
+
+# Re-validate with Supabase once the access token is this close to expiry
+JWT_EXPIRY_MARGIN_SECONDS = 60
+
+
+def _jwt_expiry(token: str) -> float | None:
+    """
+    Read the exp claim from a JWT without a network call.
+
+    The signature is not checked - Supabase already verified the token at login.
+
+    Args:
+        token: Encoded JWT access token
+
+    Returns:
+        float: Expiry as a Unix timestamp, or None if the token can't be decoded
+    """
+    try:
+        payload_segment = token.split(".")[1]
+        padded = payload_segment + "=" * (-len(payload_segment) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        return float(payload["exp"])
+    except (IndexError, KeyError, ValueError, TypeError, AttributeError):
+        return None
+
+
+def _session_jwt_expiry(access_token: str) -> float | None:
+    """Get the access token's expiry, decoding it only once per token per session."""
+    cached = st.session_state.get("_jwt_payload")
+    if not cached or cached.get("token") != access_token:
+        cached = {"token": access_token, "exp": _jwt_expiry(access_token)}
+        st.session_state["_jwt_payload"] = cached
+    return cached["exp"]
+
+
+def _token_id(access_token: str) -> str:
+    """Stable fingerprint of an access token, so session_state never needs a second copy of it."""
+    return hashlib.sha256(access_token.encode()).hexdigest()
+
+
+def _extract_session_tokens(session) -> tuple[str | None, str | None]:
+    """
+    Extract access and refresh tokens from a stored session.
+
+    Args:
+        session: Session dict (from persist_session) or legacy session object
+
+    Returns:
+        tuple: (access_token, refresh_token), either may be None
+    """
+    access_token = None
+    refresh_token = None
+
+    # Handle dict format (from persist_session)
+    if isinstance(session, dict):
+        access_token = session.get("access_token")
+        refresh_token = session.get("refresh_token")
+    # Handle object format (legacy)
+    else:
+        if hasattr(session, "access_token"):
+            access_token = session.access_token
+        elif hasattr(session, "token"):
+            access_token = session.token
+
+        if hasattr(session, "refresh_token"):
+            refresh_token = session.refresh_token
+
+    return access_token, refresh_token
+
+
+@st.cache_resource(show_spinner=False)
+def _create_supabase_client(url: str, service_role: bool) -> Client:
+    """
+    Create a Supabase client once per process and share it across reruns and sessions.
+
+    Reusing the client keeps its HTTP connection pool warm instead of paying
+    TLS setup again on every rerun.
+
+    Args:
+        url: Supabase URL (part of the cache key, so a changed URL gets a new client)
+        service_role: Whether to build the client with the service_role key
+
+    Returns:
+        Client: Shared Supabase client instance
+    """
+    return create_client(url, get_supabase_key(service_role=service_role))
 
 
 def get_client(service_role=False) -> Client:
@@ -22,7 +111,7 @@ def get_client(service_role=False) -> Client:
     Returns:
         Client: Supabase client instance with session rehydrated if available
     """
-    global _supabase_client, _supabase_service_client
+    global _client_access_token
     
     # Validate config (only checks if secrets exist, not database connectivity)
     # This should not block if secrets are present, even if DB queries fail
@@ -35,14 +124,10 @@ def get_client(service_role=False) -> Client:
     url = get_supabase_url()
     
     if service_role:
-        if _supabase_service_client is None:
-            key = get_supabase_key(service_role=True)
-            _supabase_service_client = create_client(url, key)
-        return _supabase_service_client
+        return _create_supabase_client(url, True)
     else:
-        if _supabase_client is None:
-            key = get_supabase_key(service_role=False)
-            _supabase_client = create_client(url, key)
+        # The anon client is shared, so rehydration below must stay idempotent
+        client = _create_supabase_client(url, False)
         
         # CRITICAL FIX: Rehydrate session from st.session_state on every call
         # This ensures the client has the session even after reruns
@@ -54,49 +139,52 @@ def get_client(service_role=False) -> Client:
         elif "auth_session" in st.session_state and st.session_state.auth_session:
             session = st.session_state.auth_session
         
-        if _supabase_client and session:
-            # Check if client already has a valid session to avoid unnecessary rehydration
+        if client and session:
+            access_token, refresh_token = _extract_session_tokens(session)
+
+            # Check if client already has a valid session to avoid unnecessary rehydration.
+            # Decode the JWT locally first: while this session has already validated the
+            # token, the shared client still holds it and it is not close to expiry,
+            # there is no need to ask Supabase.
             needs_rehydration = True
-            try:
-                current_user = _supabase_client.auth.get_user()
-                user_obj = current_user.user if hasattr(current_user, "user") else current_user
-                if user_obj and hasattr(user_obj, "id"):
-                    # Client has valid session, check if it matches stored user
-                    stored_user = st.session_state.get("auth_user")
-                    if stored_user:
-                        stored_id = getattr(stored_user, "id", None) if hasattr(stored_user, "id") else None
-                        if stored_id and user_obj.id == stored_id:
-                            needs_rehydration = False  # Session already valid and matches
-            except Exception:
-                # Client has no session or error, needs rehydration
-                import logging
-                logging.info("get_client: Client has no valid session (get_user() failed) - rehydration needed")
+            token_id = _token_id(access_token) if access_token else None
+            expiry = _session_jwt_expiry(access_token) if access_token else None
+            if (
+                token_id is not None
+                and st.session_state.get("_validated_token_id") == token_id
+                and expiry is not None
+                and expiry - time.time() > JWT_EXPIRY_MARGIN_SECONDS
+                and access_token == _client_access_token
+            ):
+                needs_rehydration = False
+            else:
+                try:
+                    current_user = client.auth.get_user()
+                    user_obj = current_user.user if hasattr(current_user, "user") else current_user
+                    if user_obj and hasattr(user_obj, "id"):
+                        # Client has valid session, check if it matches stored user
+                        stored_user = st.session_state.get("auth_user")
+                        if stored_user:
+                            stored_id = getattr(stored_user, "id", None) if hasattr(stored_user, "id") else None
+                            if stored_id and user_obj.id == stored_id:
+                                needs_rehydration = False  # Session already valid and matches
+                                _client_access_token = access_token
+                                st.session_state["_validated_token_id"] = token_id
+                except Exception:
+                    # Client has no session or error, needs rehydration
+                    import logging
+                    logging.info("get_client: Client has no valid session (get_user() failed) - rehydration needed")
             
             if needs_rehydration:
                 import logging
-                logging.info("get_client: Session rehydration needed - extracting tokens from st.session_state")
-                # Extract tokens from session object or dict
-                access_token = None
-                refresh_token = None
-                
-                # Handle dict format (from persist_session)
-                if isinstance(session, dict):
-                    access_token = session.get("access_token")
-                    refresh_token = session.get("refresh_token")
-                # Handle object format (legacy)
-                else:
-                    if hasattr(session, "access_token"):
-                        access_token = session.access_token
-                    elif hasattr(session, "token"):
-                        access_token = session.token
-                    
-                    if hasattr(session, "refresh_token"):
-                        refresh_token = session.refresh_token
+                logging.info("get_client: Session rehydration needed - applying tokens from st.session_state")
                 
                 # Rehydrate client with stored session tokens
                 if access_token and refresh_token:
                     try:
-                        _supabase_client.auth.set_session(access_token, refresh_token)
+                        client.auth.set_session(access_token, refresh_token)
+                        _client_access_token = access_token
+                        st.session_state["_validated_token_id"] = _token_id(access_token)
                         logging.info("get_client: Session rehydration successful (set_session called)")
                     except (TypeError, AttributeError):
                         # Fallback for different API versions
@@ -106,7 +194,9 @@ def get_client(service_role=False) -> Client:
                                 "refresh_token": refresh_token,
                                 "token_type": "bearer"
                             }
-                            _supabase_client.auth.set_session(session_dict)
+                            client.auth.set_session(session_dict)
+                            _client_access_token = access_token
+                            st.session_state["_validated_token_id"] = _token_id(access_token)
                             logging.info("get_client: Session rehydration successful (dict format fallback)")
                         except Exception as e:
                             # If rehydration fails, continue anyway
@@ -118,7 +208,7 @@ def get_client(service_role=False) -> Client:
                 import logging
                 logging.info("get_client: Session rehydration skipped - client already has valid session")
         
-        return _supabase_client
+        return client
 
 
 def persist_session(client: Client):
@@ -156,15 +246,13 @@ def persist_session(client: Client):
 
 def clear_persisted_session():
     """Clear persisted session from st.session_state."""
-    if "supabase_session" in st.session_state:
-        del st.session_state["supabase_session"]
-    if "auth_session" in st.session_state:
-        del st.session_state["auth_session"]
+    for key in ("supabase_session", "auth_session", "_jwt_payload", "_validated_token_id"):
+        st.session_state.pop(key, None)
 
 
 def reset_clients():
     """Reset client instances (useful for testing or re-authentication)."""
-    global _supabase_client, _supabase_service_client
-    _supabase_client = None
-    _supabase_service_client = None
+    global _client_access_token
+    _create_supabase_client.clear()
+    _client_access_token = None
 
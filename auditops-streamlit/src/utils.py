@@ -1,9 +1,37 @@
 """
 Common utility functions for date formatting, UI helpers, etc.
 """
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, date, timedelta
-from typing import Optional
+from functools import lru_cache
+from typing import Any, Callable, Optional
+import logging
+import threading
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+
+@lru_cache(maxsize=1024)
+def _parse_iso_datetime(value: str) -> datetime:
+    """
+    Parse an ISO datetime string. Cached, since pages re-render the same
+    timestamps (check-ins, decisions, log entries) on every rerun.
+
+    Raises ValueError for invalid input, like datetime.fromisoformat.
+    """
+    # fromisoformat only accepts a trailing "Z" from Python 3.11
+    if value.endswith("Z"):
+        return datetime.fromisoformat(value[:-1] + "+00:00")
+    return datetime.fromisoformat(value)
+
+
+@lru_cache(maxsize=1024)
+def _format_datetime_str(value: str, format_str: str) -> str:
+    """Format an ISO datetime string. Cached like _parse_iso_datetime."""
+    try:
+        return _parse_iso_datetime(value).strftime(format_str)
+    except ValueError:
+        return value
 
 
 def format_datetime(dt: Optional[datetime | str], format_str: str = "%Y-%m-%d %H:%M") -> str:
@@ -12,10 +40,7 @@ def format_datetime(dt: Optional[datetime | str], format_str: str = "%Y-%m-%d %H
         return "—"
     
     if isinstance(dt, str):
-        try:
-            dt = datetime.fromisoformat(dt.replace("Z", "+00:00"))
-        except ValueError:
-            return dt
+        return _format_datetime_str(dt, format_str)
     
     if isinstance(dt, datetime):
         return dt.strftime(format_str)
@@ -23,16 +48,22 @@ def format_datetime(dt: Optional[datetime | str], format_str: str = "%Y-%m-%d %H
     return str(dt)
 
 
+@lru_cache(maxsize=1024)
+def _format_date_str(value: str, format_str: str) -> str:
+    """Format an ISO date string. Cached like _format_datetime_str."""
+    try:
+        return date.fromisoformat(value).strftime(format_str)
+    except ValueError:
+        return value
+
+
 def format_date(d: Optional[date | str], format_str: str = "%Y-%m-%d") -> str:
     """Format date to string."""
     if d is None:
         return "—"
     
     if isinstance(d, str):
-        try:
-            d = date.fromisoformat(d)
-        except ValueError:
-            return d
+        return _format_date_str(d, format_str)
     
     if isinstance(d, date):
         return d.strftime(format_str)
@@ -74,9 +105,9 @@ def calculate_hours(check_in: datetime, check_out: Optional[datetime]) -> Option
         return None
     
     if isinstance(check_in, str):
-        check_in = datetime.fromisoformat(check_in.replace("Z", "+00:00"))
+        check_in = _parse_iso_datetime(check_in)
     if isinstance(check_out, str):
-        check_out = datetime.fromisoformat(check_out.replace("Z", "+00:00"))
+        check_out = _parse_iso_datetime(check_out)
     
     delta = check_out - check_in
     return delta.total_seconds() / 3600.0
@@ -170,3 +201,50 @@ def get_user_display_name(profile: Optional[dict]) -> str:
         return profile.get("name", profile.get("full_name", profile.get("email", "Unknown")))
     return str(profile)
 
+
+def run_in_parallel(*calls: Callable[[], Any]) -> list:
+    """
+    Run independent zero-argument calls (e.g. Supabase reads) concurrently.
+
+    The worker threads get the current script run context, so calls that read
+    st.session_state or use st.cache_data behave as they do on the main thread.
+
+    Returns:
+        list: Results in the same order as the calls. The first exception raised
+        by a call is re-raised here.
+    """
+    if len(calls) < 2:
+        return [call() for call in calls]
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(
+        max_workers=len(calls),
+        initializer=add_script_run_ctx,
+        initargs=(None, ctx),
+    ) as executor:
+        futures = [executor.submit(call) for call in calls]
+    return [future.result() for future in futures]
+
+
+# Shared pool for work the page doesn't wait on (e.g. client approval writes)
+_background_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="auditops-bg")
+
+
+def run_in_background(call: Callable[[], Any]) -> Future:
+    """
+    Run a zero-argument call without waiting for it, so the page isn't blocked.
+
+    The call gets the current script run context like run_in_parallel. Any
+    exception is logged. The returned Future can be kept (e.g. in session state)
+    and checked on a later run; fire-and-forget callers can ignore it.
+    """
+    ctx = get_script_run_ctx()
+
+    def run():
+        add_script_run_ctx(threading.current_thread(), ctx)
+        try:
+            return call()
+        except Exception:
+            logging.exception("Background call failed")
+            raise
+
+    return _background_executor.submit(run)
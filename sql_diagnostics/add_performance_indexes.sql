@@ -0,0 +1,45 @@
+-- ============================================
+-- PERFORMANCE INDEXES
+-- ============================================
+-- Indexes backing the app's hot lookup paths.
+-- All statements are idempotent (IF NOT EXISTS) and safe to re-run.
+--
+-- Usage:
+--   psql $DATABASE_URL -f sql_diagnostics/add_performance_indexes.sql
+--   OR run via Supabase SQL Editor
+-- ============================================
+
+-- ============================================
+-- app_users: PIN login lookup
+-- ============================================
+-- login_with_pin() filters app_users by passcode on every login attempt.
+-- Without an index this is a sequential scan of the whole table.
+-- NOTE: Not UNIQUE - registration derives the initial PIN from the last
+-- 4 digits of the phone number, so existing rows may share a passcode.
+CREATE INDEX IF NOT EXISTS idx_app_users_passcode ON app_users(passcode);
+
+
+-- ============================================
+-- clients: Client Directory search
+-- ============================================
+-- search_clients() matches the search text with ILIKE '%text%' against
+-- client_name, address and contact_person. A leading wildcard can't use a
+-- btree index, so these are trigram (pg_trgm) GIN indexes instead.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS idx_clients_client_name_trgm ON clients USING gin (client_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_clients_address_trgm ON clients USING gin (address gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_clients_contact_person_trgm ON clients USING gin (contact_person gin_trgm_ops);
+
+
+-- ============================================
+-- VERIFICATION
+-- ============================================
+SELECT tablename, indexname, indexdef
+FROM pg_indexes
+WHERE indexname IN (
+    'idx_app_users_passcode',
+    'idx_clients_client_name_trgm',
+    'idx_clients_address_trgm',
+    'idx_clients_contact_person_trgm'
+)
+ORDER BY tablename, indexname;
@@ -18,6 +18,7 @@ skip_reason = None
 try:
     from src.db import (
         get_approvals_by_shift,
+        get_approvals_by_shifts,
         get_approval,
         create_approval,
         diagnose_approvals_query
@@ -109,6 +110,36 @@ class TestGetApprovalsByShift:
                 assert 'name' in approval['approver'] or 'email' in approval['approver']
 
 
+class TestGetApprovalsByShifts:
+    """Test suite for the batched get_approvals_by_shifts function."""
+
+    def test_returns_empty_dict_for_no_shifts(self):
+        """Test that an empty shift list returns an empty dict without querying."""
+        result = get_approvals_by_shifts([])
+
+        assert result == {}, "Should return empty dict for no shift ids"
+
+    def test_omits_nonexistent_shifts(self):
+        """Test that shifts without approvals are absent from the result."""
+        nonexistent_id = "99999999-9999-9999-9999-999999999999"
+
+        result = get_approvals_by_shifts([nonexistent_id])
+
+        assert isinstance(result, dict), "Should return a dict"
+        assert nonexistent_id not in result, "Nonexistent shift should have no entry"
+
+    def test_matches_single_shift_query(self):
+        """Test that the batched result matches get_approvals_by_shift per shift."""
+        shift_id = "00000000-0000-0000-0000-000000000000"
+
+        batched = get_approvals_by_shifts([shift_id]).get(shift_id, [])
+        single = get_approvals_by_shift(shift_id)
+
+        assert [a.get('id') for a in batched] == [a.get('id') for a in single]
+        for approval in batched:
+            assert 'approver' in approval, "Should have 'approver' field"
+
+
 class TestGetApproval:
     """Test suite for get_approval function."""
 
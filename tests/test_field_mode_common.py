@@ -0,0 +1,77 @@
+"""
+Unit tests for the Field Mode shift helpers.
+
+These tests verify that today's open and submit-ready shifts are picked
+out of an auditor's shift list without tripping over bad rows.
+"""
+import pytest
+import sys
+import os
+from datetime import date
+
+# Add parent directory to path to import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'auditops-streamlit'))
+
+# Try to import field mode helpers - skip all tests if imports fail
+skip_reason = None
+
+try:
+    from src.field_mode_common import find_today_shifts
+    IMPORTS_AVAILABLE = True
+except ImportError as e:
+    IMPORTS_AVAILABLE = False
+    skip_reason = f"Field mode imports not available: {e}"
+
+# Skip all tests in this module if imports failed
+pytestmark = pytest.mark.skipif(
+    not IMPORTS_AVAILABLE,
+    reason=skip_reason or "Field mode dependencies not available"
+)
+
+
+TODAY = date(2025, 3, 14)
+
+
+class TestFindTodayShifts:
+    """Test suite for find_today_shifts function."""
+
+    def test_open_shift_today(self):
+        """Test that a checked-in shift today is returned as open."""
+        shift = {"id": 1, "status": "draft", "check_in": "2025-03-14T09:00:00+00:00", "check_out": None}
+        assert find_today_shifts([shift], TODAY) == (shift, None)
+
+    def test_closed_shift_today(self):
+        """Test that a checked-out draft today is returned as ready to submit."""
+        shift = {
+            "id": 1,
+            "status": "draft",
+            "check_in": "2025-03-14T09:00:00+00:00",
+            "check_out": "2025-03-14T17:00:00+00:00"
+        }
+        assert find_today_shifts([shift], TODAY) == (None, shift)
+
+    def test_shift_from_yesterday(self):
+        """Test that shifts from earlier days are ignored."""
+        shift = {"id": 1, "status": "draft", "check_in": "2025-03-13T23:30:00+00:00", "check_out": None}
+        assert find_today_shifts([shift], TODAY) == (None, None)
+
+    def test_malformed_check_in(self):
+        """Test that unparseable or missing check-ins are skipped without raising."""
+        shifts = [
+            {"id": 1, "status": "draft", "check_in": "2025-03-14Tnot-a-time", "check_out": None},
+            {"id": 2, "status": "draft", "check_in": None, "check_out": None},
+            {"id": 3, "status": "draft", "check_out": None},
+        ]
+        assert find_today_shifts(shifts, TODAY) == (None, None)
+
+    def test_newest_shift_wins(self):
+        """Test that the first (newest) match of each kind is returned."""
+        newest_open = {"id": 3, "status": "draft", "check_in": "2025-03-14T15:00:00+00:00", "check_out": None}
+        older_open = {"id": 2, "status": "submitted", "check_in": "2025-03-14T12:00:00+00:00", "check_out": None}
+        closed = {
+            "id": 1,
+            "status": "draft",
+            "check_in": "2025-03-14T08:00:00+00:00",
+            "check_out": "2025-03-14T11:00:00+00:00"
+        }
+        assert find_today_shifts([newest_open, older_open, closed], TODAY) == (newest_open, closed)